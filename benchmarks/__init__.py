@@ -0,0 +1 @@
+"""Benchmarks of the integration against a local fake controller."""
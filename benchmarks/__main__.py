@@ -0,0 +1,75 @@
+"""Run the benchmarks, save the results and compare them with a baseline."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from .harness import Result, format_results, save_results
+from .suites import BENCHMARKS, BenchmarkOptions
+
+
+async def _async_run(names: list[str], options: BenchmarkOptions) -> list[Result]:
+    """Run the named benchmarks one after the other."""
+    results: list[Result] = []
+    for name in names:
+        results.extend(await BENCHMARKS[name](options))
+    return results
+
+
+def main() -> None:
+    """Parse the command line and run."""
+    parser = argparse.ArgumentParser(
+        prog="scripts/bench",
+        description=(
+            "Benchmark the integration against a local fake controller. Results "
+            "are saved per commit in benchmarks/results."
+        ),
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="BENCHMARK",
+        help=f"benchmarks to run, all by default: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random extra seconds per request"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="share of requests answered with a server error",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="fewer iterations, for a smoke run"
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="results file to show the change against"
+    )
+    parser.add_argument("--output", type=Path, help="where to save the results")
+    args = parser.parse_args()
+    if unknown := set(args.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    # Loading an untested custom integration is expected here
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    options = BenchmarkOptions(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        iterations=50 if args.quick else 500,
+    )
+    results = asyncio.run(_async_run(args.benchmarks or list(BENCHMARKS), options))
+    path = save_results(results, args.output)
+    print(format_results(results, args.compare))  # noqa: T201
+    print(f"\nSaved to {path}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
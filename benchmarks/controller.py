@@ -0,0 +1,249 @@
+"""Local stand-in for a HenCoop controller."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from multiprocessing import Queue
+
+
+@dataclass
+class FakeController:
+    """
+    Serve the controller API from memory, with injectable latency and failures.
+
+    Every request sleeps `latency` plus up to `jitter` seconds before it is
+    answered, and fails with a 500 at `failure_rate`. Random draws come from
+    a generator seeded with `seed`, so runs are reproducible. Door commands
+    leave both reed sensors open for `travel` seconds before the door arrives.
+    With `stream` set, door states are also pushed as server-sent events.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    # Tag door status responses and answer matching If-None-Match with 304
+    etag: bool = False
+    travel: float = 0.0
+    stream: bool = False
+    seed: int = 0
+    top: bool = False
+    bottom: bool = True
+    pins: dict[int, int] = field(default_factory=dict)
+    requests: int = 0
+    # Requests per path, and conditional reads answered with 304
+    paths: Counter[str] = field(default_factory=Counter)
+    not_modified: int = 0
+    failures: int = 0
+    _random: random.Random = field(init=False, repr=False)
+    _runner: web.AppRunner | None = field(default=None, init=False, repr=False)
+    _arrival: asyncio.TimerHandle | None = field(default=None, init=False, repr=False)
+    # Events waiting to be written to each open stream, None ends the stream
+    _streams: set[asyncio.Queue[bytes | None]] = field(
+        default_factory=set, init=False, repr=False
+    )
+    url: str = field(default="", init=False)
+
+    def __post_init__(self) -> None:
+        """Seed the random generator."""
+        self._random = random.Random(self.seed)  # noqa: S311
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application implementing the API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/door-status", self._door_status)
+        app.router.add_get("/door-status/events", self._door_status_events)
+        app.router.add_get("/gpio", self._gpio_pins)
+        app.router.add_get("/gpio/{pin}", self._gpio_pin)
+        for path in ("/open-door", "/close-door", "/stop"):
+            app.router.add_post(path, self._command)
+        # Not part of the controller API, lets a benchmark move the door
+        app.router.add_post("/_flip", self._flip)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the API, on a free port unless one is given, and return its URL."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0]
+        self.url = f"http://{bound[0]}:{bound[1]}"
+        return self.url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        self.drop_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Count the request and apply latency and failure injection."""
+        self.requests += 1
+        self.paths[request.path] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.failures += 1
+            raise web.HTTPInternalServerError
+        return await handler(request)
+
+    async def _door_status(self, request: web.Request) -> web.Response:
+        tag = f'"{int(self.top)}{int(self.bottom)}"'
+        if self.etag and request.headers.get("If-None-Match") == tag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": tag})
+        return web.json_response(
+            {"top": self.top, "bottom": self.bottom},
+            headers={"ETag": tag} if self.etag else None,
+        )
+
+    async def _door_status_events(self, request: web.Request) -> web.StreamResponse:
+        if not self.stream:
+            raise web.HTTPNotFound
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._streams.add(queue)
+        try:
+            await response.write(self._event())
+            while (event := await queue.get()) is not None:
+                await response.write(event)
+        finally:
+            self._streams.discard(queue)
+        return response
+
+    def drop_streams(self) -> None:
+        """End every open stream, as a controller restart would."""
+        for queue in self._streams:
+            queue.put_nowait(None)
+
+    def _event(self) -> bytes:
+        """Return the door status as a server-sent event."""
+        data = json.dumps({"top": self.top, "bottom": self.bottom})
+        return f"data: {data}\n\n".encode()
+
+    async def _gpio_pin(self, request: web.Request) -> web.Response:
+        pin = int(request.match_info["pin"])
+        return web.json_response({"pin": pin, "value": self.pins.get(pin, 0)})
+
+    async def _gpio_pins(self, request: web.Request) -> web.Response:
+        pins = [int(pin) for pin in request.query["pins"].split(",")]
+        return web.json_response(
+            {"pins": {str(pin): self.pins.get(pin, 0) for pin in pins}}
+        )
+
+    async def _command(self, request: web.Request) -> web.Response:
+        self._cancel_arrival()
+        if request.path != "/stop":
+            opening = request.path == "/open-door"
+            if self.travel:
+                self.move(top=False, bottom=False)
+                self._arrival = asyncio.get_running_loop().call_later(
+                    self.travel, self._arrive, opening
+                )
+            else:
+                self._arrive(opening)
+        return web.json_response({"status": "ok"})
+
+    async def _flip(self, _: web.Request) -> web.Response:
+        """Move the door to the end position its top sensor is not at, at once."""
+        self._cancel_arrival()
+        self._arrive(opening=not self.top)
+        return web.json_response({"top": self.top, "bottom": self.bottom})
+
+    def _arrive(self, opening: bool) -> None:  # noqa: FBT001
+        self._arrival = None
+        self.move(top=opening, bottom=not opening)
+
+    def move(self, *, top: bool, bottom: bool) -> None:
+        """Set the reed sensors, pushing the change to open streams."""
+        changed = (top, bottom) != (self.top, self.bottom)
+        self.top, self.bottom = top, bottom
+        if changed:
+            for queue in self._streams:
+                queue.put_nowait(self._event())
+
+    def _cancel_arrival(self) -> None:
+        if self._arrival is not None:
+            self._arrival.cancel()
+            self._arrival = None
+
+
+def fleet_app(controllers: list[FakeController]) -> web.Application:
+    """Return one application serving each controller under `/coop<index>`."""
+    app = web.Application()
+    for index, controller in enumerate(controllers):
+        app.add_subapp(f"/coop{index}", controller.app())
+    return app
+
+
+def serve_fleet(count: int, port_queue: Queue[int], **kwargs: Any) -> None:
+    """
+    Serve a fleet of `count` controllers until the process is terminated.
+
+    Meant to run in its own process, so serving does not add to the event
+    loop lag of the Home Assistant under test. The port is put on the queue
+    once the fleet is listening.
+    """
+
+    async def _async_serve() -> None:
+        runner = web.AppRunner(
+            fleet_app([FakeController(seed=index, **kwargs) for index in range(count)]),
+            access_log=None,
+        )
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        port_queue.put(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(_async_serve())
+
+
+async def _async_serve(port: int, controller: FakeController) -> None:
+    """Serve until cancelled."""
+    url = await controller.async_start(port=port)
+    print(f"Fake controller listening on {url}")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await controller.async_stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=FakeController.__doc__)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--etag", action="store_true")
+    parser.add_argument("--travel", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true")
+    args = parser.parse_args()
+    controller = FakeController(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        etag=args.etag,
+        travel=args.travel,
+        stream=args.stream,
+    )
+    asyncio.run(_async_serve(args.port, controller))
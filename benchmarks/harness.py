@@ -0,0 +1,164 @@
+"""Timing, Home Assistant and result helpers shared by the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import __version__ as HA_VERSION  # noqa: N812
+from homeassistant.core import CoreState, HomeAssistant
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class Result:
+    """Outcome of one benchmark."""
+
+    name: str
+    # The number runs are compared by
+    value: float
+    unit: str
+    higher_is_better: bool
+    # Supporting numbers, e.g. percentiles, not compared
+    details: dict[str, float] = field(default_factory=dict)
+
+
+async def async_time(
+    func: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 10
+) -> list[float]:
+    """Return the seconds each of `iterations` calls of `func` took."""
+    for _ in range(warmup):
+        await func()
+    timings = []
+    for _ in range(iterations):
+        started = perf_counter()
+        await func()
+        timings.append(perf_counter() - started)
+    return timings
+
+
+def latency_result(name: str, timings: list[float]) -> Result:
+    """Summarize per-call timings as median milliseconds."""
+    ordered = sorted(timings)
+    return Result(
+        name=name,
+        value=statistics.median(ordered) * 1000,
+        unit="ms",
+        higher_is_better=False,
+        details={
+            "p95": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+            "max": ordered[-1] * 1000,
+            "n": len(ordered),
+        },
+    )
+
+
+def rate_result(name: str, count: int, seconds: float, unit: str) -> Result:
+    """Summarize `count` operations done in `seconds` as a rate."""
+    return Result(
+        name=name,
+        value=count / seconds,
+        unit=unit,
+        higher_is_better=True,
+        details={"n": count, "seconds": seconds},
+    )
+
+
+@asynccontextmanager
+async def async_home_assistant() -> AsyncIterator[HomeAssistant]:
+    """
+    Run a bare Home Assistant instance with a throwaway config directory.
+
+    Only the registries and config entries are loaded, integrations are
+    set up by the benchmarks themselves. The integration is loaded from this
+    checkout.
+    """
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await hass.config.async_set_time_zone("UTC")
+        hass.config.skip_pip = True
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        loader.async_setup(hass)
+        await bootstrap.async_load_base_functionality(hass)
+        hass.set_state(CoreState.running)
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+def _git(*args: str) -> str:
+    """Return the output of a git command in the checkout."""
+    return subprocess.run(  # noqa: S603
+        ["git", *args],  # noqa: S607
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stdout.strip()
+
+
+def save_results(
+    results: list[Result], path: Path | None = None, kind: str = "bench"
+) -> Path:
+    """
+    Write results with the commit they were measured on.
+
+    Returns:
+        Path written, `results/<kind>-<commit>.json` unless given
+
+    """
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    if path is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / f"{kind}-{commit}{'-dirty' if dirty else ''}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "dirty": dirty,
+                "created": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "homeassistant": HA_VERSION,
+                "machine": platform.machine(),
+                "results": {result.name: asdict(result) for result in results},
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+    return path
+
+
+def format_results(results: list[Result], baseline: Path | None = None) -> str:
+    """Return a table of results, with the change against a saved baseline."""
+    previous: dict[str, Any] = {}
+    if baseline is not None:
+        previous = json.loads(baseline.read_text())["results"]
+    lines = [f"{'benchmark':<40} {'value':>12} {'unit':<10} change"]
+    for result in results:
+        change = ""
+        if (old := previous.get(result.name)) is not None and old["value"]:
+            delta = (result.value - old["value"]) / old["value"] * 100
+            better = (delta > 0) == result.higher_is_better
+            change = f"{delta:+.1f}% {'better' if better else 'worse'}"
+        lines.append(
+            f"{result.name:<40} {result.value:>12.3f} {result.unit:<10} {change}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,400 @@
+"""Load and soak test a fleet of controllers on one Home Assistant instance."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import math
+import multiprocessing
+import os
+import random
+import resource
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, perf_counter
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import aiohttp
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_API_TOKEN, CONF_HOST, EVENT_STATE_CHANGED
+from homeassistant.helpers import entity_registry as er
+
+from .controller import serve_fleet
+from .harness import Result, async_home_assistant, format_results, save_results
+from .suites import DOMAIN, GPIO_PINS, _module
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, EventStateChangedData
+
+# Seconds between event loop lag samples
+LAG_SAMPLE_INTERVAL = 0.05
+# Seconds between restarts of fast polling, well within its window
+FAST_POLL_RESTART = 15
+
+
+@dataclass
+class LoadOptions:
+    """Shape of the simulated load."""
+
+    # Seconds of sustained load per fleet size
+    duration: float = 60
+    # Seconds between alternating open_all and close_all service calls, 0 for none
+    storm_interval: float = 30
+    # Seconds between flipping the doors of a tenth of the fleet on the fake
+    flip_interval: float = 2
+    # Seconds a door takes to travel on the fake
+    travel: float = 2
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    fleet_scheduling: bool = False
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Return the value below which `percentile` % of values fall, 0 if none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)]
+
+
+def _rss_mb() -> float:
+    """Return the resident memory of this process in MiB."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except OSError:
+        # Peak instead of current outside Linux, still shows growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _open_sessions() -> int:
+    """Return the client sessions alive and not closed."""
+    gc.collect()
+    return sum(
+        1
+        for obj in gc.get_objects()
+        if isinstance(obj, aiohttp.ClientSession) and not obj.closed
+    )
+
+
+async def _async_monitor_lag(samples: list[float]) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    while True:
+        started = perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append(perf_counter() - started - LAG_SAMPLE_INTERVAL)
+
+
+async def _async_start_fleet(
+    count: int, options: LoadOptions
+) -> tuple[multiprocessing.Process, int]:
+    """Start the fake controllers in their own process and return its port."""
+    context = multiprocessing.get_context("spawn")
+    port_queue = context.Queue()
+    process = context.Process(
+        target=serve_fleet,
+        args=(count, port_queue),
+        kwargs={
+            "latency": options.latency,
+            "jitter": options.jitter,
+            "failure_rate": options.failure_rate,
+            "travel": options.travel,
+        },
+        daemon=True,
+    )
+    process.start()
+    port = await asyncio.to_thread(port_queue.get, timeout=60)
+    return process, port
+
+
+def _config_entry(index: int, url: str, options: LoadOptions) -> ConfigEntry:
+    """Return an entry for the controller served under `/coop<index>`."""
+    return ConfigEntry(
+        data={CONF_HOST: f"{url}/coop{index}", CONF_API_TOKEN: "token"},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={
+            "gpio_pins": GPIO_PINS[:2],
+            "fleet_scheduling": options.fleet_scheduling,
+        },
+        source=SOURCE_USER,
+        title=f"Coop {index}",
+        unique_id=None,
+        version=1,
+    )
+
+
+async def async_run_load(  # noqa: PLR0915
+    count: int, options: LoadOptions
+) -> tuple[list[Result], list[str]]:
+    """
+    Soak `count` controllers under polling, flips and command storms.
+
+    Returns:
+        Results, and a description of every leak found after unloading
+
+    """
+    controllers = _module("controllers")
+    process, port = await _async_start_fleet(count, options)
+    url = f"http://127.0.0.1:{port}"
+    lag: list[float] = []
+    latencies: list[float] = []
+    # Controllers flipped on the fake, waiting for their state to change
+    flipped: dict[int, float] = {}
+    storms: list[float] = []
+    leaks: list[str] = []
+    prefix = f"load.{count}"
+    async with (
+        async_home_assistant() as hass,
+        aiohttp.ClientSession() as fake_session,
+    ):
+        tasks_before = set(asyncio.all_tasks())
+        sessions_before = _open_sessions()
+        rss_before = _rss_mb()
+
+        entries = [_config_entry(index, url, options) for index in range(count)]
+        started = perf_counter()
+        await asyncio.gather(*(hass.config_entries.async_add(e) for e in entries))
+        await hass.async_block_till_done()
+        setup = perf_counter() - started
+        rss_setup = _rss_mb()
+        coordinators = list(hass.data[controllers.DATA_CONTROLLERS].values())
+
+        registry = er.async_get(hass)
+        top_sensors = {
+            registry.async_get_entity_id(
+                "binary_sensor", DOMAIN, f"{entry.entry_id}_top"
+            ): index
+            for index, entry in enumerate(entries)
+        }
+
+        def _state_changed(event: Event[EventStateChangedData]) -> None:
+            index = top_sensors.get(event.data["entity_id"])
+            if index is not None and (flipped_at := flipped.pop(index, None)):
+                latencies.append(monotonic() - flipped_at)
+
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+
+        async def _async_flip(index: int) -> None:
+            async with fake_session.post(f"{url}/coop{index}/_flip") as response:
+                response.raise_for_status()
+            flipped[index] = monotonic()
+
+        async def _async_storm(service: str) -> None:
+            started = perf_counter()
+            await hass.services.async_call(DOMAIN, service, blocking=True)
+            storms.append(perf_counter() - started)
+
+        def _requests() -> int:
+            return sum(
+                metrics.requests
+                for coordinator in coordinators
+                for metrics in coordinator.client.metrics.endpoints.values()
+            )
+
+        monitor = hass.async_create_background_task(
+            _async_monitor_lag(lag), "load lag monitor"
+        )
+        requests_before = _requests()
+        soak_started = monotonic()
+        next_fast_poll = next_storm = next_flip = soak_started
+        storm_tasks: set[asyncio.Task[None]] = set()
+        opening = True
+        rng = random.Random(count)  # noqa: S311
+        while (now := monotonic()) < soak_started + options.duration:
+            if now >= next_fast_poll:
+                for coordinator in coordinators:
+                    coordinator.async_start_fast_polling()
+                next_fast_poll = now + FAST_POLL_RESTART
+            if options.storm_interval and now >= next_storm:
+                task = hass.async_create_task(
+                    _async_storm("open_all" if opening else "close_all")
+                )
+                storm_tasks.add(task)
+                task.add_done_callback(storm_tasks.discard)
+                opening = not opening
+                next_storm = now + options.storm_interval
+            if now >= next_flip:
+                wanted = rng.sample(range(count), max(count // 10, 1))
+                await asyncio.gather(
+                    *(_async_flip(index) for index in wanted if index not in flipped)
+                )
+                next_flip = now + options.flip_interval
+            await asyncio.sleep(0.1)
+        elapsed = monotonic() - soak_started
+        requests = _requests() - requests_before
+        errors = sum(coordinator.client.metrics.errors for coordinator in coordinators)
+        rss_end = _rss_mb()
+
+        monitor.cancel()
+        unsub()
+        await asyncio.gather(*storm_tasks, return_exceptions=True)
+        await asyncio.gather(
+            *(hass.config_entries.async_unload(e.entry_id) for e in entries)
+        )
+        await hass.async_block_till_done()
+        await asyncio.sleep(0)
+
+        if leftover := len(hass.data.get(controllers.DATA_CONTROLLERS, {})):
+            leaks.append(f"{leftover} controllers still registered")
+        tasks = [
+            task
+            for task in asyncio.all_tasks() - tasks_before
+            if not task.done() and task is not monitor
+        ]
+        leaks.extend(f"task {task.get_name()}: {task.get_coro()}" for task in tasks)
+        if (sessions := _open_sessions() - sessions_before) > 0:
+            leaks.append(f"{sessions} client sessions not closed")
+
+    process.terminate()
+    process.join()
+    return [
+        Result(f"{prefix}.setup", setup, "s", higher_is_better=False),
+        Result(
+            f"{prefix}.loop_lag_p99",
+            _percentile(lag, 99) * 1000,
+            "ms",
+            higher_is_better=False,
+            details={"p50": _percentile(lag, 50) * 1000, "max": max(lag) * 1000},
+        ),
+        Result(
+            f"{prefix}.state_latency_p99",
+            _percentile(latencies, 99) * 1000,
+            "ms",
+            higher_is_better=False,
+            details={
+                "p50": _percentile(latencies, 50) * 1000,
+                "n": len(latencies),
+                "missed": len(flipped),
+            },
+        ),
+        Result(
+            f"{prefix}.requests_per_second",
+            requests / elapsed,
+            "requests/s",
+            higher_is_better=True,
+            details={"errors": errors},
+        ),
+        Result(
+            f"{prefix}.storm_p99",
+            _percentile(storms, 99),
+            "s",
+            higher_is_better=False,
+            details={"n": len(storms)},
+        ),
+        Result(
+            f"{prefix}.memory_per_controller",
+            (rss_setup - rss_before) / count * 1024,
+            "KiB",
+            higher_is_better=False,
+        ),
+        Result(
+            f"{prefix}.memory_growth",
+            rss_end - rss_setup,
+            "MiB",
+            higher_is_better=False,
+        ),
+        Result(f"{prefix}.leaks", len(leaks), "count", higher_is_better=False),
+    ], leaks
+
+
+async def _async_run(
+    counts: list[int], options: LoadOptions
+) -> tuple[list[Result], list[str]]:
+    """Soak each fleet size in turn, each on a fresh Home Assistant."""
+    results: list[Result] = []
+    leaks: list[str] = []
+    for count in counts:
+        count_results, count_leaks = await async_run_load(count, options)
+        results.extend(count_results)
+        leaks.extend(f"{count} controllers: {leak}" for leak in count_leaks)
+    return results, leaks
+
+
+def main() -> None:
+    """Parse the command line and run."""
+    parser = argparse.ArgumentParser(
+        prog="scripts/soak",
+        description=(
+            "Set up fleets of simulated controllers and keep them busy with fast "
+            "polling, door flips and command storms. Exits with an error if "
+            "sessions, tasks or controllers leak after unloading."
+        ),
+    )
+    parser.add_argument(
+        "--controllers",
+        default="1,10,100",
+        help="comma separated fleet sizes to run, e.g. 1,50,300",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=60, help="seconds of load per fleet size"
+    )
+    parser.add_argument(
+        "--storm-interval",
+        type=float,
+        default=30,
+        help="seconds between open and close commands to all doors, 0 for none",
+    )
+    parser.add_argument(
+        "--flip-interval",
+        type=float,
+        default=2,
+        help="seconds between door flips of a tenth of the fleet",
+    )
+    parser.add_argument(
+        "--travel", type=float, default=2, help="seconds a door takes to move"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random extra seconds per request"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="share of requests answered with a server error",
+    )
+    parser.add_argument(
+        "--fleet-scheduling",
+        action="store_true",
+        help="enable fleet scheduling on every entry",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="results file to show the change against"
+    )
+    parser.add_argument("--output", type=Path, help="where to save the results")
+    args = parser.parse_args()
+
+    # Loading an untested custom integration is expected here
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    options = LoadOptions(
+        duration=args.duration,
+        storm_interval=args.storm_interval,
+        flip_interval=args.flip_interval,
+        travel=args.travel,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        fleet_scheduling=args.fleet_scheduling,
+    )
+    counts = [int(count) for count in args.controllers.split(",")]
+    results, leaks = asyncio.run(_async_run(counts, options))
+    path = save_results(results, args.output, kind="load")
+    print(format_results(results, args.compare))  # noqa: T201
+    print(f"\nSaved to {path}")  # noqa: T201
+    if leaks:
+        print("\nLeaks after unloading:", *leaks, sep="\n  ")  # noqa: T201
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Benchmarks of the client, coordinator and entities against a fake controller."""
+
+from __future__ import annotations
+
+import importlib
+from contextlib import suppress
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_API_TOKEN, CONF_HOST, EVENT_STATE_CHANGED
+
+from .controller import FakeController
+from .harness import (
+    Result,
+    async_home_assistant,
+    async_time,
+    latency_result,
+    rate_result,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+# The integration directory is not a valid module name
+PACKAGE = "custom_components.hacs-hen-coop"
+DOMAIN = "hacs-hen-coop"
+# Pins watched where a benchmark exercises the GPIO binary sensors
+GPIO_PINS = [str(pin) for pin in range(1, 9)]
+
+
+@dataclass
+class BenchmarkOptions:
+    """Knobs shared by all benchmarks."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    # Iterations of the timed loops, lower for a quick run
+    iterations: int = 500
+
+    def controller(self, **kwargs: Any) -> FakeController:
+        """Return a fake controller with the injected latency and failures."""
+        return FakeController(
+            latency=self.latency,
+            jitter=self.jitter,
+            failure_rate=self.failure_rate,
+            **kwargs,
+        )
+
+
+def _module(name: str) -> Any:
+    """Import a module of the integration."""
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+def _unlimited(client: Any) -> Any:
+    """Lift the rate limiter, the benchmarks measure the client itself."""
+    client.limiter.configure(read_rate=1e9, command_rate=1e9)
+    return client
+
+
+async def bench_decode(options: BenchmarkOptions) -> list[Result]:
+    """Time decoding door status and GPIO payloads into models, without I/O."""
+    api = _module("api")
+    models = _module("models")
+    door = b'{"top": true, "bottom": false}'
+    gpio = (
+        b'{"pins": {'
+        + b", ".join(b'"%d": %d' % (pin, pin % 2) for pin in range(1, 41))
+        + b"}}"
+    )
+    loops = options.iterations * 100
+    results = []
+    for name, body, decode in (
+        ("decode.door_status", door, models.DoorStatus.from_json),
+        ("decode.gpio_40_pins", gpio, models.GpioBank.from_json),
+    ):
+        started = perf_counter()
+        for _ in range(loops):
+            decode(api.json_loads(body))
+        elapsed = perf_counter() - started
+        results.append(
+            Result(
+                name=name,
+                value=elapsed / loops * 1e6,
+                unit="us",
+                higher_is_better=False,
+                details={"n": loops},
+            )
+        )
+    return results
+
+
+async def bench_client(options: BenchmarkOptions) -> list[Result]:
+    """Time round trips of the API client to the fake controller."""
+    api = _module("api")
+    controllers = _module("controllers")
+    results = []
+    for name, etag in (
+        ("client.door_status", False),
+        ("client.door_status_304", True),
+    ):
+        controller = options.controller(etag=etag)
+        url = await controller.async_start()
+        async with async_home_assistant() as hass:
+            session = controllers.async_create_controller_session(hass, url)
+            client = _unlimited(api.HenCoopApiClient(url, "token", session))
+            errors = 0
+
+            async def door_status(client: Any = client) -> None:
+                nonlocal errors
+                # Skip the short response cache, every call reaches the server
+                client._invalidate_cache()  # noqa: SLF001
+                try:
+                    await client.async_door_status()
+                except api.HenCoopApiClientError:
+                    errors += 1
+
+            timings = await async_time(door_status, options.iterations)
+            result = latency_result(name, timings)
+            result.details["errors"] = errors
+            results.append(result)
+            results.append(
+                rate_result(
+                    f"{name}.throughput",
+                    len(timings),
+                    sum(timings),
+                    "requests/s",
+                )
+            )
+            await client.async_close()
+            await session.close()
+        await controller.async_stop()
+    return results
+
+
+async def _async_setup_entry(
+    hass: HomeAssistant, url: str, options: dict[str, Any] | None = None
+) -> ConfigEntry:
+    """Add an entry through the config flow and set it up."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: url, CONF_API_TOKEN: "token"}
+    )
+    entry = result["result"]
+    if options:
+        # Reloads the entry with the options applied
+        hass.config_entries.async_update_entry(entry, options=options)
+    await hass.async_block_till_done()
+    _unlimited(entry.runtime_data.coordinator.client)
+    return entry
+
+
+async def bench_coordinator(options: BenchmarkOptions) -> list[Result]:
+    """Time coordinator refreshes and what they add to the bare round trip."""
+    controller = options.controller()
+    url = await controller.async_start()
+    async with async_home_assistant() as hass:
+        entry = await _async_setup_entry(hass, url, {"gpio_pins": GPIO_PINS})
+        coordinator = entry.runtime_data.coordinator
+        client = coordinator.client
+
+        async def refresh() -> None:
+            client._invalidate_cache()  # noqa: SLF001
+            await coordinator.async_refresh()
+
+        async def round_trip() -> None:
+            client._invalidate_cache()  # noqa: SLF001
+            with suppress(Exception):
+                await client.async_door_status()
+
+        refreshes = latency_result(
+            "coordinator.refresh", await async_time(refresh, options.iterations)
+        )
+        round_trips = latency_result(
+            "coordinator.round_trip", await async_time(round_trip, options.iterations)
+        )
+        await hass.config_entries.async_unload(entry.entry_id)
+    await controller.async_stop()
+    overhead = Result(
+        name="coordinator.refresh_overhead",
+        value=refreshes.value - round_trips.value,
+        unit="ms",
+        higher_is_better=False,
+        details={"refresh": refreshes.value, "round_trip": round_trips.value},
+    )
+    return [refreshes, overhead]
+
+
+async def bench_setup(options: BenchmarkOptions) -> list[Result]:
+    """Time setting up and unloading a config entry with all its platforms."""
+    controller = options.controller()
+    url = await controller.async_start()
+    async with async_home_assistant() as hass:
+        entry = await _async_setup_entry(hass, url, {"gpio_pins": GPIO_PINS})
+        await hass.config_entries.async_unload(entry.entry_id)
+
+        async def timed(action: Callable[[str], Awaitable[bool]]) -> float:
+            started = perf_counter()
+            await action(entry.entry_id)
+            await hass.async_block_till_done()
+            return perf_counter() - started
+
+        setups, unloads = [], []
+        for _ in range(max(options.iterations // 20, 5)):
+            setups.append(await timed(hass.config_entries.async_setup))
+            unloads.append(await timed(hass.config_entries.async_unload))
+    await controller.async_stop()
+    return [
+        latency_result("config_entry.setup", setups),
+        latency_result("config_entry.unload", unloads),
+    ]
+
+
+async def bench_state_writes(options: BenchmarkOptions) -> list[Result]:
+    """Count entity state writes for coordinator updates that flip every value."""
+    models = _module("models")
+    controller = options.controller()
+    url = await controller.async_start()
+    async with async_home_assistant() as hass:
+        entry = await _async_setup_entry(hass, url, {"gpio_pins": GPIO_PINS})
+        coordinator = entry.runtime_data.coordinator
+        writes = 0
+
+        def count(_: Any) -> None:
+            nonlocal writes
+            writes += 1
+
+        statuses = [
+            models.CoopStatus(
+                models.DoorStatus(top=top, bottom=not top),
+                models.GpioBank(0 if top else 0x1FE),
+            )
+            for top in (True, False)
+        ]
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, count)
+        started = perf_counter()
+        for index in range(options.iterations):
+            coordinator.async_set_updated_data(statuses[index % 2])
+        await hass.async_block_till_done()
+        elapsed = perf_counter() - started
+        unsub()
+        await hass.config_entries.async_unload(entry.entry_id)
+    await controller.async_stop()
+    result = rate_result("entities.state_writes", writes, elapsed, "writes/s")
+    result.details["updates"] = options.iterations
+    return [result]
+
+
+BENCHMARKS: dict[str, Callable[[BenchmarkOptions], Awaitable[list[Result]]]] = {
+    "decode": bench_decode,
+    "client": bench_client,
+    "coordinator": bench_coordinator,
+    "setup": bench_setup,
+    "state_writes": bench_state_writes,
+}
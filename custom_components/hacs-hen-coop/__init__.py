@@ -7,30 +7,42 @@ https://github.com/NilsKrueger/integration_bluephacs-hen-cooprint
 
 from __future__ import annotations
 
-from datetime import timedelta
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_API_TOKEN, CONF_HOST, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import HenCoopApiClient
-from .const import DOMAIN, LOGGER
-from .coordinator import HenCoopDataUpdateCoordinator
+from .const import DOMAIN
+from .controllers import (
+    async_acquire_controller,
+    async_release_controller,
+    async_remove_controller_store,
+)
 from .data import HenCoopData
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import HenCoopConfigEntry
 
 PLATFORMS: list[Platform] = [
-    # Platform.SENSOR,
+    Platform.SENSOR,
     Platform.BINARY_SENSOR,
     Platform.COVER,
-    # Platform.SWITCH,
+    Platform.SWITCH,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services shared by all entries."""
+    async_setup_services(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -38,24 +50,20 @@ async def async_setup_entry(
     entry: HenCoopConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = HenCoopDataUpdateCoordinator(
-        hass=hass,
-        logger=LOGGER,
-        name=DOMAIN,
-        update_interval=timedelta(hours=1),
-    )
+    # Entries pointing at the same controller share its coordinator
+    coordinator = await async_acquire_controller(hass, entry)
     entry.runtime_data = HenCoopData(
-        client=HenCoopApiClient(
-            host=entry.data[CONF_HOST],
-            token=entry.data[CONF_API_TOKEN],
-            session=async_get_clientsession(hass),
-        ),
+        client=coordinator.client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
     )
 
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_first_refresh()
+    except Exception:
+        await async_release_controller(hass, entry)
+        raise
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -68,7 +76,17 @@ async def async_unload_entry(
     entry: HenCoopConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        await async_release_controller(hass, entry)
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: HenCoopConfigEntry,
+) -> None:
+    """Remove what was stored for a deleted entry."""
+    await async_remove_controller_store(hass, entry)
 
 
 async def async_reload_entry(
@@ -2,12 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
 import socket
-from typing import Any
+from contextlib import nullcontext
+from http import HTTPStatus
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
 
+from .metrics import HenCoopMetrics
+from .models import DoorStatus, GpioBank, GpioReading
+from .ratelimit import HenCoopRateLimiter, RequestBudget
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
+    from contextlib import AbstractAsyncContextManager
+
+    from .tracing import HenCoopRequestTracer
+
+# Seconds a GET response is reused for identical reads
+GET_CACHE_TTL = 0.2
+# Seconds a request may take, door commands get this on top of the motor run
+REQUEST_TIMEOUT = 10
+# Attempts for idempotent reads, and the base of their jittered backoff
+GET_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+# Consecutive failed requests that open the circuit, and seconds until a
+# request is let through again to probe the controller
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 30
+
+# Returned for a conditional GET the controller answered with 304
+NOT_MODIFIED: Any = object()
+
 
 class HenCoopApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -35,6 +70,116 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     response.raise_for_status()
 
 
+class _CircuitBreaker:
+    """Fail fast while the controller is clearly down."""
+
+    def __init__(self) -> None:
+        """Initialize the breaker closed."""
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    def before_request(self) -> None:
+        """Raise if requests should not reach the controller right now."""
+        if self._opened_at is None:
+            return
+        if monotonic() - self._opened_at < CIRCUIT_OPEN_SECONDS:
+            msg = (
+                f"Controller unreachable after {self._failures} failed requests, "
+                "not trying again yet"
+            )
+            raise HenCoopApiClientCommunicationError(msg)
+        # Half-open: let this request probe the controller and hold back the
+        # rest for another round
+        self._opened_at = monotonic()
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker at the threshold."""
+        self._failures += 1
+        if self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._opened_at = monotonic()
+
+
+class HenCoopCommandJob:
+    """Handle for a door command running in the background."""
+
+    def __init__(self, command: str, duration: float, task: asyncio.Task[Any]) -> None:
+        """
+        Initialize the job.
+
+        Args:
+            command: Name of the command, e.g. "open-door"
+            duration: Motor operation duration in seconds
+            task: Task sending the command
+
+        """
+        self.command = command
+        self.duration = duration
+        self.started = monotonic()
+        self._task = task
+        # Nobody may await a job that fails after its caller moved on
+        task.add_done_callback(
+            lambda task: task.cancelled() or task.exception(),
+        )
+
+    @property
+    def done(self) -> bool:
+        """Return if the controller has answered the command."""
+        return self._task.done()
+
+    @property
+    def elapsed(self) -> float:
+        """Return seconds since the command was sent."""
+        return monotonic() - self.started
+
+    @property
+    def progress(self) -> float:
+        """Return the share of the motor run that has elapsed, from 0 to 1."""
+        if self.done or not self.duration:
+            return 1.0
+        return min(self.elapsed / self.duration, 1.0)
+
+    async def async_wait(self) -> Any:
+        """
+        Wait for the controller to answer the command.
+
+        Cancelling the wait, e.g. from a caller's own timeout, leaves the
+        command running.
+
+        Returns:
+            Status response
+
+        """
+        return await asyncio.shield(self._task)
+
+    def add_done_callback(self, callback: Callable[[HenCoopCommandJob], None]) -> None:
+        """Call `callback` with this job once the controller has answered."""
+        self._task.add_done_callback(lambda _: callback(self))
+
+    @property
+    def cancelled(self) -> bool:
+        """Return if the command was cancelled before the controller answered."""
+        return self._task.cancelled()
+
+    def cancel(self) -> None:
+        """
+        Stop sending the command, or waiting for its answer.
+
+        A request already sent is aborted, the controller may still act on it.
+        """
+        self._task.cancel()
+
+    def exception(self) -> BaseException | None:
+        """Return the error a finished command failed with."""
+        if self._task.cancelled():
+            return asyncio.CancelledError()
+        return self._task.exception()
+
+
 class HenCoopApiClient:
     """Hen Coop API Client."""
 
@@ -43,6 +188,7 @@ class HenCoopApiClient:
         host: str,
         token: str,
         session: aiohttp.ClientSession,
+        tracer: HenCoopRequestTracer | None = None,
     ) -> None:
         """
         Initialize the API client.
@@ -51,14 +197,29 @@ class HenCoopApiClient:
             host: The host address of the API server (including http:// and port)
             token: Bearer token for authentication
             session: aiohttp client session
+            tracer: Tracer whose trace config the session was created with
 
         """
         self._host = host.rstrip("/")
         self._token = token
         self._session = session
         self._headers = {"Authorization": f"Bearer {token}"}
-
-    async def async_read_gpio_pin(self, pin: int) -> dict[str, int]:
+        # In-flight and recently completed decoded GETs, keyed by URL
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._cache_generation = 0
+        # ETag of the last full GET response per URL, and the model decoded
+        # from the response an ETag was sent for
+        self._etags: dict[str, str] = {}
+        self._validated: dict[str, tuple[str, Any]] = {}
+        self._circuit = _CircuitBreaker()
+        self.metrics = HenCoopMetrics()
+        self.limiter = HenCoopRateLimiter(self.metrics)
+        self.tracer = tracer
+        # Held for every read attempt, shared with other controllers' clients
+        self.read_slot: Callable[[], AbstractAsyncContextManager[None]] | None = None
+
+    async def async_read_gpio_pin(self, pin: int) -> GpioReading:
         """
         Read the logic level of a specific GPIO pin.
 
@@ -66,19 +227,32 @@ class HenCoopApiClient:
             pin: GPIO pin number (1-40)
 
         Returns:
-            Dict containing pin number and value
+            Pin number and value
+
+        """
+        return await self._cached_get(f"{self._host}/gpio/{pin}", GpioReading.from_json)
+
+    async def async_read_gpio_pins(self, pins: Iterable[int]) -> GpioBank:
+        """
+        Read the logic level of several GPIO pins in one request.
+
+        Args:
+            pins: GPIO pin numbers (1-40)
+
+        Returns:
+            Bitmask with bit `pin` set for every pin reading high
 
         """
-        return await self._api_wrapper(
-            method="get",
-            url=f"{self._host}/gpio/{pin}",
+        query = ",".join(str(pin) for pin in sorted(set(pins)))
+        return await self._cached_get(
+            f"{self._host}/gpio?pins={query}", GpioBank.from_json
         )
 
     async def async_open_door(
         self, duration: int = 120, duty_cycle: int = 75
     ) -> dict[str, Any]:
         """
-        Open the coop door.
+        Open the coop door and wait for the controller to answer.
 
         Args:
             duration: Motor operation duration in seconds
@@ -88,9 +262,28 @@ class HenCoopApiClient:
             Status response
 
         """
-        return await self._api_wrapper(
-            method="post",
-            url=f"{self._host}/open-door",
+        job = await self.async_start_open_door(duration, duty_cycle)
+        return await job.async_wait()
+
+    async def async_start_open_door(
+        self, duration: int = 120, duty_cycle: int = 75
+    ) -> HenCoopCommandJob:
+        """
+        Open the coop door without waiting for the motor run.
+
+        Only waits for the rate limiter to allow the command.
+
+        Args:
+            duration: Motor operation duration in seconds
+            duty_cycle: PWM duty cycle percentage
+
+        Returns:
+            Handle to await or follow the command
+
+        """
+        return await self._async_start_command(
+            command="open-door",
+            duration=duration,
             params={"duration": duration, "duty_cycle": duty_cycle},
         )
 
@@ -98,7 +291,7 @@ class HenCoopApiClient:
         self, duration: int = 120, duty_cycle: int = 75
     ) -> dict[str, Any]:
         """
-        Close the coop door.
+        Close the coop door and wait for the controller to answer.
 
         Args:
             duration: Motor operation duration in seconds
@@ -108,9 +301,28 @@ class HenCoopApiClient:
             Status response
 
         """
-        return await self._api_wrapper(
-            method="post",
-            url=f"{self._host}/close-door",
+        job = await self.async_start_close_door(duration, duty_cycle)
+        return await job.async_wait()
+
+    async def async_start_close_door(
+        self, duration: int = 120, duty_cycle: int = 75
+    ) -> HenCoopCommandJob:
+        """
+        Close the coop door without waiting for the motor run.
+
+        Only waits for the rate limiter to allow the command.
+
+        Args:
+            duration: Motor operation duration in seconds
+            duty_cycle: PWM duty cycle percentage
+
+        Returns:
+            Handle to await or follow the command
+
+        """
+        return await self._async_start_command(
+            command="close-door",
+            duration=duration,
             params={"duration": duration, "duty_cycle": duty_cycle},
         )
 
@@ -122,12 +334,9 @@ class HenCoopApiClient:
             Status response
 
         """
-        return await self._api_wrapper(
-            method="post",
-            url=f"{self._host}/stop",
-        )
+        return await self._command(url=f"{self._host}/stop")
 
-    async def async_door_status(self) -> dict[str, Any]:
+    async def async_door_status(self) -> DoorStatus:
         """
         Get the current state of both reed sensors.
 
@@ -135,43 +344,334 @@ class HenCoopApiClient:
             Reed sensor states
 
         """
-        return await self._api_wrapper(
-            method="get",
-            url=f"{self._host}/door-status",
+        return await self._cached_get(f"{self._host}/door-status", DoorStatus.from_json)
+
+    async def async_door_status_events(self) -> AsyncIterator[DoorStatus]:
+        """
+        Stream reed sensor states pushed by the controller.
+
+        Opens one long-lived server-sent events connection and yields a
+        payload shaped like `async_door_status` for every transition. The
+        controller is expected to send a comment line as heartbeat while the
+        door rests, so a silent connection is treated as dead.
+
+        Yields:
+            Reed sensor states
+
+        """
+        try:
+            async with self._session.get(
+                f"{self._host}/door-status/events",
+                headers={**self._headers, "Accept": "text/event-stream"},
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=REQUEST_TIMEOUT, sock_read=90
+                ),
+            ) as response:
+                _verify_response_or_raise(response)
+                data: list[str] = []
+                async for raw_line in response.content:
+                    line = raw_line.decode().rstrip("\r\n")
+                    if not line:
+                        # A blank line dispatches the buffered event
+                        if data:
+                            yield DoorStatus.from_json(json_loads("\n".join(data)))
+                            data.clear()
+                        continue
+                    field, _, value = line.partition(":")
+                    if field == "data":
+                        data.append(value.removeprefix(" "))
+
+        except TimeoutError as exception:
+            msg = f"Timeout error streaming door status - {exception}"
+            raise HenCoopApiClientCommunicationError(
+                msg,
+            ) from exception
+        except (aiohttp.ClientError, socket.gaierror) as exception:
+            msg = f"Error streaming door status - {exception}"
+            raise HenCoopApiClientCommunicationError(
+                msg,
+            ) from exception
+        except (KeyError, TypeError, ValueError) as exception:
+            msg = f"Invalid door status event - {exception}"
+            raise HenCoopApiClientError(
+                msg,
+            ) from exception
+
+    async def _cached_get[T](self, url: str, decode: Callable[[Any], T]) -> T:
+        """
+        Make a GET request shared by concurrent and closely following callers.
+
+        Identical reads that arrive while a request is in flight await the same
+        response, and a completed response is reused for `GET_CACHE_TTL`. The
+        response is decoded once, callers share the immutable result.
+
+        Args:
+            url: API endpoint URL
+            decode: Turns the JSON response into a model, raising KeyError,
+                TypeError or ValueError if it is malformed
+
+        Returns:
+            Decoded API response
+
+        """
+        cached = self._cache.get(url)
+        if cached is not None and monotonic() - cached[0] < GET_CACHE_TTL:
+            return cached[1]
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._decoded_get(url, decode)
+            )
+            self._inflight[url] = task
+            generation = self._cache_generation
+
+            def _finished(task: asyncio.Task[Any]) -> None:
+                if self._inflight.get(url) is task:
+                    del self._inflight[url]
+                if (
+                    not task.cancelled()
+                    and task.exception() is None
+                    and generation == self._cache_generation
+                ):
+                    self._cache[url] = (monotonic(), task.result())
+
+            task.add_done_callback(_finished)
+
+        # Shield so one cancelled caller does not fail everyone sharing the read
+        return await asyncio.shield(task)
+
+    async def _decoded_get[T](self, url: str, decode: Callable[[Any], T]) -> T:
+        """
+        Make a GET request and decode its response.
+
+        If the controller tagged the last response with an ETag, the request
+        is made conditional and a 304 returns the model decoded back then,
+        unchanged and without reading or decoding a body.
+        """
+        validated = self._validated.get(url)
+        data = await self._api_wrapper(
+            method="get", url=url, etag=validated[0] if validated else None
+        )
+        if data is NOT_MODIFIED and validated is not None:
+            return validated[1]
+        try:
+            model = decode(data)
+        except (AttributeError, KeyError, TypeError, ValueError) as exception:
+            msg = f"Invalid response from {url} - {exception}"
+            raise HenCoopApiClientError(
+                msg,
+            ) from exception
+        if (etag := self._etags.get(url)) is not None:
+            self._validated[url] = (etag, model)
+        else:
+            self._validated.pop(url, None)
+        return model
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session requests are made with."""
+        return self._session
+
+    @property
+    def token(self) -> str:
+        """Return the token requests are authenticated with."""
+        return self._token
+
+    async def async_close(self) -> None:
+        """Cancel reads still in flight, the client is not used afterwards."""
+        tasks = list(self._inflight.values())
+        self._invalidate_cache()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _invalidate_cache(self) -> None:
+        """Forget cached and in-flight reads so the next read hits the controller."""
+        self._cache_generation += 1
+        self._cache.clear()
+        self._inflight.clear()
+
+    async def _async_start_command(
+        self,
+        command: str,
+        duration: float,
+        params: dict[str, Any],
+    ) -> HenCoopCommandJob:
+        """
+        Send a door command in the background once the rate limiter allows it.
+
+        The token is taken before the request starts, so a command held back
+        by the limiter can still be cancelled before it reaches the controller.
+        The controller may only answer once the motor run is over, so the
+        request gets the motor run on top of the usual timeout.
+
+        Args:
+            command: API endpoint name
+            duration: Motor operation duration in seconds
+            params: Query parameters
+
+        Returns:
+            Handle to await or follow the command
+
+        """
+        await self.limiter.async_acquire(RequestBudget.COMMAND)
+        task = asyncio.get_running_loop().create_task(
+            self._command(
+                url=f"{self._host}/{command}",
+                params=params,
+                request_timeout=duration + REQUEST_TIMEOUT,
+            )
         )
+        return HenCoopCommandJob(command, duration, task)
+
+    async def _command(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+    ) -> Any:
+        """
+        Send a door command, invalidating reads taken before it landed.
+
+        Args:
+            url: API endpoint URL
+            params: Query parameters
+            request_timeout: Seconds the request may take
+
+        Returns:
+            API response as JSON
+
+        """
+        self._invalidate_cache()
+        try:
+            return await self._api_wrapper(
+                method="post", url=url, params=params, request_timeout=request_timeout
+            )
+        finally:
+            self._invalidate_cache()
 
-    async def _api_wrapper(
+    async def _api_wrapper(  # noqa: PLR0913
         self,
         method: str,
         url: str,
         data: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+        etag: str | None = None,
     ) -> Any:
         """
-        Make an API request.
+        Make an API request, retrying idempotent reads on communication errors.
+
+        Every read attempt first waits for the rate limiter, then holds the
+        `read_slot` if one is set, but not while backing off. Door commands
+        were paid for before they were started, stop requests go out at once.
+        Only failed reads open the circuit breaker, and stop requests are sent
+        even while it is open: a stop must never be held back.
 
         Args:
             method: HTTP method
             url: API endpoint URL
             data: Request body data
             params: Query parameters
+            request_timeout: Seconds each attempt may take
+            etag: ETag of a response already held, sent as If-None-Match
 
         Returns:
-            API response as JSON
+            API response as JSON, or NOT_MODIFIED
 
         """
+        endpoint = self._endpoint(url)
+        if endpoint != "/stop":
+            self._circuit.before_request()
+        metrics = self.metrics.endpoint(endpoint)
+        # Commands are only sent once, their token was taken when started
+        budget = RequestBudget.READ if method == "get" else None
+        attempts = GET_ATTEMPTS if method == "get" else 1
+        slot = self.read_slot if budget is RequestBudget.READ else None
+        for attempt in range(1, attempts + 1):
+            await self.limiter.async_acquire(budget)
+            try:
+                async with slot() if slot is not None else nullcontext():
+                    started = monotonic()
+                    result = await self._api_request(
+                        method, url, data, params, request_timeout, etag
+                    )
+            except HenCoopApiClientError as exception:
+                metrics.observe(monotonic() - started, exception.__cause__ or exception)
+                if not isinstance(exception, HenCoopApiClientCommunicationError):
+                    raise
+                if attempt == attempts:
+                    if method == "get":
+                        self._circuit.record_failure()
+                    raise
+                # Full jitter keeps retries of many clients from lining up
+                await asyncio.sleep(
+                    random.uniform(0, RETRY_BACKOFF * 2 ** (attempt - 1))  # noqa: S311
+                )
+            else:
+                metrics.observe(monotonic() - started)
+                self._circuit.record_success()
+                return result
+        return None
+
+    def _endpoint(self, url: str) -> str:
+        """Return the endpoint metrics of a request are recorded under."""
+        path = url.removeprefix(self._host).partition("?")[0]
+        return "/gpio/{pin}" if path.startswith("/gpio/") else path
+
+    async def _api_request(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        params: dict[str, Any] | None,
+        request_timeout: float,
+        etag: str | None = None,
+    ) -> Any:
+        """
+        Make a single API request.
+
+        Args:
+            method: HTTP method
+            url: API endpoint URL
+            data: Request body data
+            params: Query parameters
+            request_timeout: Seconds the request may take
+            etag: ETag of a response already held, sent as If-None-Match
+
+        Returns:
+            API response as JSON, or NOT_MODIFIED
+
+        """
+        headers = self._headers
+        if etag is not None:
+            headers = {**headers, aiohttp.hdrs.IF_NONE_MATCH: etag}
         try:
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(request_timeout):
                 response = await self._session.request(
                     method=method,
                     url=url,
-                    headers=self._headers,
+                    headers=headers,
                     json=data,
                     params=params,
                 )
                 _verify_response_or_raise(response)
-                return await response.json()
-
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    response.release()
+                    return NOT_MODIFIED
+                if method == "get":
+                    if new_etag := response.headers.get(aiohttp.hdrs.ETAG):
+                        self._etags[url] = new_etag
+                    else:
+                        self._etags.pop(url, None)
+                # The controller only speaks JSON, skip aiohttp's content type
+                # check and decode with the fastest parser available
+                body = await response.read()
+                return json_loads(body) if body else None
+
+        except HenCoopApiClientError:
+            raise
         except TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
             raise HenCoopApiClientCommunicationError(
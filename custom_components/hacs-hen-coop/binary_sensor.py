@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import (
@@ -10,26 +11,39 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 
-from .const import LOGGER
+from .const import CONF_GPIO_PINS, LOGGER
 from .entity import HenCoopEntity
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import HenCoopDataUpdateCoordinator
     from .data import HenCoopConfigEntry
+    from .models import DoorStatus
+
+
+@dataclass(frozen=True, kw_only=True)
+class HenCoopBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a HenCoop reed sensor."""
+
+    value_fn: Callable[[DoorStatus], bool]
+
 
 ENTITY_DESCRIPTIONS = (
-    BinarySensorEntityDescription(
+    HenCoopBinarySensorEntityDescription(
         key="top",
         name="HenCoop Binary Sensor Top",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
+        value_fn=lambda door: door.top,
     ),
-    BinarySensorEntityDescription(
+    HenCoopBinarySensorEntityDescription(
         key="bottom",
         name="HenCoop Binary Sensor Bottom",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
+        value_fn=lambda door: door.bottom,
     ),
 )
 
@@ -42,26 +56,51 @@ async def async_setup_entry(
     """Set up the binary_sensor platform."""
     LOGGER.debug(f"Setting up HenCoop binary sensors from entry {entry.entry_id}")
 
+    coordinator = entry.runtime_data.coordinator
     async_add_entities(
         HenCoopBinarySensor(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
+            entry=entry,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
     )
+    async_add_entities(
+        HenCoopGpioBinarySensor(
+            coordinator=coordinator,
+            entry=entry,
+            entity_description=BinarySensorEntityDescription(
+                key=f"gpio_{pin}",
+                name=f"Hen Coop GPIO {pin}",
+                icon="mdi:pin",
+            ),
+            pin=pin,
+        )
+        # The coordinator polls the pins of every entry sharing the controller
+        for pin in sorted(int(pin) for pin in entry.options.get(CONF_GPIO_PINS, []))
+    )
 
 
 class HenCoopBinarySensor(HenCoopEntity, BinarySensorEntity):
     """HenCoop binary_sensor class."""
 
+    entity_description: HenCoopBinarySensorEntityDescription
+
     def __init__(
         self,
         coordinator: HenCoopDataUpdateCoordinator,
-        entity_description: BinarySensorEntityDescription,
+        entry: HenCoopConfigEntry,
+        entity_description: HenCoopBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary_sensor class."""
-        # Pass the entity_description key as unique_id_suffix to the parent class
-        super().__init__(coordinator, unique_id_suffix=entity_description.key)
+        # Pass the entity_description key as unique_id_suffix to the parent
+        # class, and only wake up when that reed sensor changed
+        super().__init__(
+            coordinator,
+            entry,
+            unique_id_suffix=entity_description.key,
+            context=entity_description.key,
+        )
         self.entity_description = entity_description
         # Use proper type for _attr_name (str or None)
         self.entity_description = entity_description
@@ -72,4 +111,33 @@ class HenCoopBinarySensor(HenCoopEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary_sensor is on."""
-        return self.coordinator.data.get(self.entity_description.key)
+        return self.entity_description.value_fn(self.coordinator.data.door)
+
+
+class HenCoopGpioBinarySensor(HenCoopEntity, BinarySensorEntity):
+    """HenCoop GPIO pin binary_sensor class, backed by the bank bitmask."""
+
+    def __init__(
+        self,
+        coordinator: HenCoopDataUpdateCoordinator,
+        entry: HenCoopConfigEntry,
+        entity_description: BinarySensorEntityDescription,
+        pin: int,
+    ) -> None:
+        """Initialize the binary_sensor class."""
+        super().__init__(
+            coordinator,
+            entry,
+            unique_id_suffix=entity_description.key,
+            context=f"gpio_{pin}",
+        )
+        self.entity_description = entity_description
+        self._pin = pin
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the GPIO pin reads high."""
+        gpio = self.coordinator.data.gpio
+        if gpio is None:
+            return None
+        return gpio.is_high(self._pin)
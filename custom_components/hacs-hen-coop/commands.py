@@ -0,0 +1,217 @@
+"""Door command queue for hacs-hen-coop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from enum import StrEnum
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+
+from .const import COMMAND_DEBOUNCE, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+    from typing import Any
+
+    from homeassistant.core import HomeAssistant
+
+
+# Resolves once a command was sent, with a future for its acceptance if any
+type _Sent = asyncio.Future[asyncio.Future[None] | None]
+
+
+class DoorCommand(StrEnum):
+    """Command for the door motor."""
+
+    OPEN = "open"
+    CLOSE = "close"
+    STOP = "stop"
+
+
+class HenCoopCommandQueue:
+    """
+    Send door commands to one controller strictly one at a time.
+
+    A command equal to the one waiting last in the queue, or to the one sent
+    within `COMMAND_DEBOUNCE` unless that failed, is merged into it. A newer
+    open, close or stop drops every waiting command that moves the door the
+    other way, and cancels one that is still being sent, e.g. held back by
+    the rate limiter, so bursts of taps and automations collapse into the
+    last intent.
+
+    The queue moves on once a command was sent. `send` may return a future
+    for the controller accepting the command, which submitters wait for
+    outside the queue, so a stop never waits behind an accept window.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[DoorCommand], Coroutine[Any, Any, asyncio.Future[None] | None]],
+        on_change: Callable[[], None],
+    ) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            hass: Home Assistant instance
+            send: Sends one command to the controller, returning a future for
+                its acceptance if the controller answers later
+            on_change: Called when the queue depth changed
+
+        """
+        self._hass = hass
+        self._send = send
+        self._on_change = on_change
+        self._pending: deque[tuple[DoorCommand, _Sent]] = deque()
+        self._worker: asyncio.Task[None] | None = None
+        # Command being sent and the task sending it
+        self._sending: tuple[DoorCommand, asyncio.Task[Any]] | None = None
+        # Last command handed to the controller, when and how it went
+        self._last: tuple[DoorCommand, float, _Sent] | None = None
+
+    @property
+    def depth(self) -> int:
+        """Return the number of commands waiting or being sent."""
+        return len(self._pending) + (self._sending is not None)
+
+    async def async_submit(
+        self, command: DoorCommand, *, supersede: bool = True
+    ) -> None:
+        """
+        Queue a command and wait until it was accepted, merged or superseded.
+
+        Args:
+            command: Command to send
+            supersede: Whether the command drops queued commands it overrides
+
+        """
+        accepted = await self.async_send(command, supersede=supersede)
+        if accepted is not None:
+            await asyncio.shield(accepted)
+
+    async def async_send(
+        self, command: DoorCommand, *, supersede: bool = True
+    ) -> asyncio.Future[None] | None:
+        """
+        Queue a command and wait until it was sent, merged or superseded.
+
+        Args:
+            command: Command to send
+            supersede: Whether the command drops queued commands it overrides
+
+        Returns:
+            Future for the controller accepting the command, shared with other
+            submitters so it should be shielded when waited for
+
+        """
+        future = self._async_enqueue(command, supersede=supersede)
+        # Shield so one cancelled caller does not drop a merged command
+        return await asyncio.shield(future)
+
+    def _async_enqueue(self, command: DoorCommand, *, supersede: bool) -> _Sent:
+        """Queue a command, returning the future it resolves with."""
+        if self._pending and self._pending[-1][0] is command:
+            LOGGER.debug(f"Merging door {command} into the queued one")
+            return self._pending[-1][1]
+
+        if (
+            not self._pending
+            and self._last is not None
+            and self._last[0] is command
+            and monotonic() - self._last[1] < COMMAND_DEBOUNCE.total_seconds()
+            and not _failed(self._last[2])
+        ):
+            LOGGER.debug(f"Merging door {command} into the one just sent")
+            return self._last[2]
+
+        if supersede:
+            for queued in list(self._pending):
+                if _supersedes(command, queued[0]):
+                    LOGGER.debug(f"Door {command} supersedes queued {queued[0]}")
+                    self._pending.remove(queued)
+                    queued[1].set_result(None)
+            if self._sending is not None and _supersedes(command, self._sending[0]):
+                LOGGER.debug(f"Door {command} supersedes {self._sending[0]} being sent")
+                self._sending[1].cancel()
+
+        future: _Sent = self._hass.loop.create_future()
+        # Retrieve the outcome even if every caller stopped waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending.append((command, future))
+        self._on_change()
+        # Started eagerly, a worker whose sends never suspend is already done
+        # when it is assigned
+        if self._worker is None or self._worker.done():
+            self._worker = self._hass.async_create_background_task(
+                self._async_run(),
+                name=f"{DOMAIN} door command queue",
+            )
+        return future
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the worker and its send, releasing everyone waiting on a command."""
+        if self._worker is not None:
+            self._worker.cancel()
+        if self._sending is not None:
+            self._sending[1].cancel()
+
+    async def _async_run(self) -> None:
+        """Send queued commands until the queue is empty."""
+        future: _Sent | None = None
+        try:
+            while self._pending:
+                command, future = self._pending.popleft()
+                send = self._hass.async_create_background_task(
+                    self._send(command), name=f"{DOMAIN} door {command}"
+                )
+                self._sending = (command, send)
+                self._last = (command, monotonic(), future)
+                try:
+                    accepted = await send
+                except asyncio.CancelledError:
+                    current = asyncio.current_task()
+                    if not send.cancelled() or (current and current.cancelling()):
+                        raise
+                    # Superseded before it was sent, nothing to merge into
+                    self._last = None
+                    future.set_result(None)
+                except Exception as exception:  # noqa: BLE001
+                    future.set_exception(exception)
+                else:
+                    future.set_result(accepted)
+                finally:
+                    self._sending = None
+                    self._on_change()
+        finally:
+            self._worker = None
+            # Shutting down cancels the worker, release whoever is still waiting
+            if future is not None:
+                future.cancel()
+            while self._pending:
+                self._pending.popleft()[1].cancel()
+
+
+def _supersedes(command: DoorCommand, other: DoorCommand) -> bool:
+    """Return if a newer command overrides an older one, a stop never is."""
+    return other is not DoorCommand.STOP and (
+        command is DoorCommand.STOP or other is not command
+    )
+
+
+def _failed(sent: _Sent) -> bool:
+    """Return if a command could not be sent or the controller refused it."""
+    if not sent.done():
+        return False
+    if sent.cancelled() or sent.exception() is not None:
+        return True
+    accepted = sent.result()
+    return (
+        accepted is not None
+        and accepted.done()
+        and (accepted.cancelled() or accepted.exception() is not None)
+    )
@@ -5,8 +5,8 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_API_TOKEN, CONF_HOST
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
     HenCoopApiClient,
@@ -14,7 +14,20 @@ from .api import (
     HenCoopApiClientCommunicationError,
     HenCoopApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_COMMAND_RATE_LIMIT,
+    CONF_FLEET_SCHEDULING,
+    CONF_GPIO_PINS,
+    CONF_READ_RATE_LIMIT,
+    CONF_REQUEST_TRACING,
+    CONF_TRAVEL_TIMEOUT,
+    DOMAIN,
+    DOOR_DURATION,
+    GPIO_PINS,
+    LOGGER,
+)
+from .controllers import async_create_controller_session
+from .ratelimit import COMMAND_RATE_LIMIT, READ_RATE_LIMIT
 
 
 class HenCoopFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,6 +35,14 @@ class HenCoopFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> HenCoopOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return HenCoopOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -70,9 +91,94 @@ class HenCoopFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _test_credentials(self, host: str, token: str) -> None:
         """Validate credentials."""
-        client = HenCoopApiClient(
-            host=host,
-            token=token,
-            session=async_create_clientsession(self.hass),
+        async with async_create_controller_session(self.hass, host) as session:
+            client = HenCoopApiClient(
+                host=host,
+                token=token,
+                session=session,
+            )
+            try:
+                await client.async_door_status()
+            finally:
+                await client.async_close()
+
+
+class HenCoopOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for HenCoop."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_GPIO_PINS,
+                        default=self.config_entry.options.get(CONF_GPIO_PINS, []),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[str(pin) for pin in GPIO_PINS],
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_TRAVEL_TIMEOUT,
+                        default=self.config_entry.options.get(
+                            CONF_TRAVEL_TIMEOUT, DOOR_DURATION
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=DOOR_DURATION,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_READ_RATE_LIMIT,
+                        default=self.config_entry.options.get(
+                            CONF_READ_RATE_LIMIT, READ_RATE_LIMIT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=50,
+                            unit_of_measurement="requests/s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_COMMAND_RATE_LIMIT,
+                        default=self.config_entry.options.get(
+                            CONF_COMMAND_RATE_LIMIT, COMMAND_RATE_LIMIT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=120,
+                            unit_of_measurement="commands/min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_FLEET_SCHEDULING,
+                        default=self.config_entry.options.get(
+                            CONF_FLEET_SCHEDULING, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_REQUEST_TRACING,
+                        default=self.config_entry.options.get(
+                            CONF_REQUEST_TRACING, False
+                        ),
+                    ): selector.BooleanSelector(),
+                },
+            ),
         )
-        await client.async_door_status()
@@ -1,8 +1,61 @@
 """Constants for HenCoop."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "hacs-hen-coop"
 ATTRIBUTION = "Data provided by http://jsonplaceholder.typicode.com/"
+
+CONF_GPIO_PINS = "gpio_pins"
+CONF_TRAVEL_TIMEOUT = "travel_timeout"
+CONF_FLEET_SCHEDULING = "fleet_scheduling"
+CONF_REQUEST_TRACING = "request_tracing"
+CONF_READ_RATE_LIMIT = "read_rate_limit"
+CONF_COMMAND_RATE_LIMIT = "command_rate_limit"
+
+STORAGE_VERSION = 1
+# Delay in seconds to batch writes of learned and restored state
+STORAGE_SAVE_DELAY = 10
+
+# Motor run sent with open and close commands
+DOOR_DURATION = 120
+DOOR_DUTY_CYCLE = 75
+# Seconds to wait for the controller to accept a command before following
+# the motor run in the background
+COMMAND_ACCEPT_TIMEOUT = 3
+# Commands the open/close/stop all services send at the same time, waiting
+# for the controllers to accept them is not limited
+GROUP_COMMAND_CONCURRENCY = 16
+# Repeating the command just sent within this window is merged into it
+COMMAND_DEBOUNCE = timedelta(seconds=2)
+GPIO_PINS = range(1, 41)
+
+# Polling cadence: slow while the door rests at an end position, fast while it
+# travels or right after a command was sent.
+IDLE_UPDATE_INTERVAL = timedelta(minutes=5)
+FAST_UPDATE_INTERVAL = timedelta(seconds=1)
+# How long to poll fast after a command, even if the door has not moved yet.
+FAST_POLL_WINDOW = timedelta(seconds=30)
+# Give up fast polling if the door is stuck between both reed sensors.
+FAST_POLL_TRANSIT_TIMEOUT = timedelta(minutes=5)
+# Reconnect backoff for the pushed door status stream; polling covers the gap.
+STREAM_RECONNECT_MIN = timedelta(seconds=1)
+STREAM_RECONNECT_MAX = timedelta(minutes=10)
+# Reed sensor polling while a command is moving the door, so the motor can be
+# stopped as soon as the end position is reached.
+TRAVEL_POLL_INTERVAL = timedelta(milliseconds=250)
+# Connection pool of each controller: connections open at a time, enough for
+# the status stream, a poll and a command, how long an idle connection is kept
+# for reuse, and how long a resolved address is cached.
+CONNECTION_LIMIT_PER_HOST = 4
+KEEPALIVE_TIMEOUT = timedelta(seconds=60)
+DNS_CACHE_TTL = timedelta(minutes=5)
+# How often request metric and daily sensors report, independent of the polling
+# cadence, so daily counts start over at midnight without a door event.
+METRICS_UPDATE_INTERVAL = timedelta(minutes=1)
+# Fleet scheduling: requests in flight across all opted-in controllers, and
+# the share by which their idle interval is jittered.
+FLEET_MAX_CONCURRENT = 8
+FLEET_JITTER = 0.1
@@ -0,0 +1,168 @@
+"""Controllers shared by the config entries of hacs-hen-coop."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp.hdrs import USER_AGENT
+from aiohttp_asyncmdnsresolver.api import AsyncDualMDNSResolver
+from homeassistant.components import zeroconf
+from homeassistant.const import CONF_API_TOKEN, CONF_HOST
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.storage import Store
+from homeassistant.util import ssl as ssl_util
+from homeassistant.util.hass_dict import HassKey
+from yarl import URL
+
+from .api import HenCoopApiClient
+from .const import (
+    CONF_REQUEST_TRACING,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    KEEPALIVE_TIMEOUT,
+    LOGGER,
+    STORAGE_VERSION,
+)
+from .coordinator import HenCoopDataUpdateCoordinator, storage_key
+from .tracing import HenCoopRequestTracer
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import HenCoopConfigEntry
+
+DATA_CONTROLLERS: HassKey[dict[str, HenCoopDataUpdateCoordinator]] = HassKey(
+    f"{DOMAIN}_controllers"
+)
+
+
+def normalize_host(host: str) -> str:
+    """Return the key of the controller a configured host points at."""
+    url = URL(host.strip() if "://" in host else f"http://{host.strip()}")
+    return f"{url.scheme}://{url.host}:{url.port}{url.path.rstrip('/')}"
+
+
+@callback
+def async_create_controller_session(
+    hass: HomeAssistant,
+    host: str,
+    trace_configs: list[aiohttp.TraceConfig] | None = None,
+) -> aiohttp.ClientSession:
+    """
+    Return a session with its own connection pool for talking to one controller.
+
+    Connections are kept alive between polls and resolved addresses are
+    cached, so fast polling does not pay a handshake per request. The caller
+    owns the session and must close it.
+    """
+    resolver = None
+    if (URL(normalize_host(host)).host or "").endswith(".local"):
+        # Resolve like Home Assistant's own sessions, only started when needed
+        resolver = AsyncDualMDNSResolver(
+            async_zeroconf=zeroconf.async_get_async_zeroconf(hass)
+        )
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT.total_seconds(),
+            ttl_dns_cache=int(DNS_CACHE_TTL.total_seconds()),
+            ssl=ssl_util.client_context(),
+            resolver=resolver,
+        ),
+        headers={USER_AGENT: SERVER_SOFTWARE},
+        trace_configs=trace_configs,
+    )
+
+
+async def async_acquire_controller(
+    hass: HomeAssistant, entry: HenCoopConfigEntry
+) -> HenCoopDataUpdateCoordinator:
+    """
+    Return the coordinator of the entry's controller, creating it if needed.
+
+    Entries pointing at the same controller share one client, coordinator and
+    command queue, so polling scales with controllers instead of entries. The
+    coordinator lives until the last entry holding it released it, or Home
+    Assistant stops. Raises
+    ConfigEntryError if the entry's API token differs from the one the
+    controller is already used with.
+    """
+    key = normalize_host(entry.data[CONF_HOST])
+    controllers = hass.data.setdefault(DATA_CONTROLLERS, {})
+    if (coordinator := controllers.get(key)) is None:
+        tracer = HenCoopRequestTracer()
+        coordinator = controllers[key] = HenCoopDataUpdateCoordinator(
+            hass,
+            key=key,
+            client=HenCoopApiClient(
+                host=entry.data[CONF_HOST],
+                token=entry.data[CONF_API_TOKEN],
+                session=async_create_controller_session(
+                    hass, entry.data[CONF_HOST], trace_configs=[tracer.trace_config]
+                ),
+                tracer=tracer,
+            ),
+        )
+        # Not tied to one config entry, so not shut down with one either
+        await coordinator.async_register_shutdown()
+    elif coordinator.client.token != entry.data[CONF_API_TOKEN]:
+        msg = f"The controller at {key} is already set up with another API token"
+        raise ConfigEntryError(msg)
+    else:
+        LOGGER.debug(f"Entry {entry.title} shares the controller at {key}")
+    coordinator.entries[entry.entry_id] = entry
+    _async_apply_options(coordinator)
+    return coordinator
+
+
+async def async_release_controller(
+    hass: HomeAssistant, entry: HenCoopConfigEntry
+) -> None:
+    """Drop the entry's hold on its controller, shutting it down if unused."""
+    key = normalize_host(entry.data[CONF_HOST])
+    controllers = hass.data.get(DATA_CONTROLLERS, {})
+    if (coordinator := controllers.get(key)) is None:
+        return
+    coordinator.entries.pop(entry.entry_id, None)
+    _async_apply_options(coordinator)
+    if not coordinator.entries:
+        del controllers[key]
+        await coordinator.async_shutdown()
+        await coordinator.async_close_session()
+
+
+@callback
+def _async_apply_options(coordinator: HenCoopDataUpdateCoordinator) -> None:
+    """Apply the options of the entries sharing the controller to its client."""
+    coordinator.client.limiter.configure(
+        coordinator.read_rate_limit, coordinator.command_rate_limit
+    )
+    fleet = coordinator.fleet
+    coordinator.client.read_slot = (
+        partial(fleet.async_slot, coordinator.key) if fleet is not None else None
+    )
+    # Trace requests while any entry asks for it
+    if (tracer := coordinator.client.tracer) is not None:
+        tracer.enabled = any(
+            entry.options.get(CONF_REQUEST_TRACING)
+            for entry in coordinator.entries.values()
+        )
+
+
+async def async_remove_controller_store(
+    hass: HomeAssistant, entry: HenCoopConfigEntry
+) -> None:
+    """Remove what was stored for the entry's controller, unless still in use."""
+    key = normalize_host(entry.data[CONF_HOST])
+    if any(
+        normalize_host(other.data[CONF_HOST]) == key
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        return
+    await Store(hass, STORAGE_VERSION, storage_key(key)).async_remove()
@@ -2,34 +2,641 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
+from dataclasses import replace
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.exceptions import ConfigEntryAuthFailed
+import async_timeout
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
 
 from .api import (
+    HenCoopApiClient,
     HenCoopApiClientAuthenticationError,
     HenCoopApiClientError,
+    HenCoopCommandJob,
 )
-from .const import LOGGER
+from .commands import DoorCommand, HenCoopCommandQueue
+from .const import (
+    COMMAND_ACCEPT_TIMEOUT,
+    CONF_COMMAND_RATE_LIMIT,
+    CONF_FLEET_SCHEDULING,
+    CONF_GPIO_PINS,
+    CONF_READ_RATE_LIMIT,
+    CONF_TRAVEL_TIMEOUT,
+    DOMAIN,
+    DOOR_DURATION,
+    DOOR_DUTY_CYCLE,
+    FAST_POLL_TRANSIT_TIMEOUT,
+    FAST_POLL_WINDOW,
+    FAST_UPDATE_INTERVAL,
+    IDLE_UPDATE_INTERVAL,
+    LOGGER,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    STREAM_RECONNECT_MAX,
+    STREAM_RECONNECT_MIN,
+    TRAVEL_POLL_INTERVAL,
+)
+from .fleet import DATA_FLEET, HenCoopFleetScheduler, async_get_fleet_scheduler
+from .history import DoorEvent, DoorHistory
+from .models import CoopStatus
+from .motion import DoorDirection, DoorMotionTracker
+from .ratelimit import COMMAND_RATE_LIMIT, READ_RATE_LIMIT
+from .travel import DoorTravelModel
 
 if TYPE_CHECKING:
+    from datetime import timedelta
+
+    from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+
     from .data import HenCoopConfigEntry
+    from .models import DoorStatus
+
+
+def storage_key(key: str) -> str:
+    """Return the storage key of the controller with the given key."""
+    return f"{DOMAIN}.{slugify(key)}"
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class HenCoopDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+class HenCoopDataUpdateCoordinator(DataUpdateCoordinator[CoopStatus]):
+    """
+    Class to manage fetching data from the API.
+
+    One coordinator serves one controller and is shared by every config entry
+    pointing at it, so it is not bound to a single entry: options are merged
+    across `entries` and background tasks are owned by the coordinator itself.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, *, key: str, client: HenCoopApiClient
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass,
+            logger=LOGGER,
+            config_entry=None,
+            name=f"{DOMAIN} {key}",
+            update_interval=IDLE_UPDATE_INTERVAL,
+            # Only notify listeners when a poll returned something new
+            always_update=False,
+        )
+        # Normalized host of the controller
+        self.key = key
+        self.client = client
+        # Loaded config entries sharing this controller
+        self.entries: dict[str, HenCoopConfigEntry] = {}
+        self._setup_lock = asyncio.Lock()
+        self._store_loaded = False
+        self._stream: asyncio.Task[None] | None = None
+        self._background_refresh: asyncio.Task[None] | None = None
+        # What listeners were last notified about, to tell keyed ones apart
+        self._dispatched: CoopStatus | None = None
+        self._dispatched_success = True
+        # Seconds the last poll took, including waiting for a fleet slot
+        self.last_update_duration: float | None = None
+        # Monotonic deadline until which we poll fast after a command
+        self._fast_poll_until = 0.0
+        # Monotonic time the door was first seen between both reed sensors
+        self._transit_since: float | None = None
+        # Whether door states are currently pushed by the controller
+        self.streaming = False
+        self.motion = DoorMotionTracker(on_travel=self._async_record_travel)
+        self.travel = DoorTravelModel()
+        self.history = DoorHistory()
+        self._travel_watch: asyncio.Task[None] | None = None
+        # Last open or close command sent to the controller, and the task
+        # waiting for the controller to accept it
+        self.command_job: HenCoopCommandJob | None = None
+        self._command_accept: asyncio.Task[None] | None = None
+        self.commands = HenCoopCommandQueue(
+            self.hass,
+            self._async_send_command,
+            self.async_update_listeners,
+        )
+        self._store: Store[dict[str, Any]] = Store(
+            self.hass, STORAGE_VERSION, storage_key(key)
+        )
+        self._unsub_close: CALLBACK_TYPE | None = None
+
+    async def async_first_refresh(self) -> None:
+        """
+        Restore stored state and refresh, unless another entry already did.
+
+        A status stored before the restart is published right away, marked
+        as restored, and the first live refresh runs in the background so
+        setup does not wait on the network. Only without a stored status is
+        the refresh awaited. Raises ConfigEntryNotReady, or
+        ConfigEntryAuthFailed, for the entry being set up if the controller
+        cannot be read then.
+        """
+        async with self._setup_lock:
+            if not self._store_loaded:
+                await self._async_restore()
+                self._store_loaded = True
+                if self.data is not None:
+                    self._background_refresh = self.hass.async_create_background_task(
+                        self.async_refresh(),
+                        name=f"{DOMAIN} {self.key} first refresh",
+                    )
+            if self.data is None or not self.last_update_success:
+                await self.async_refresh()
+        if not self.last_update_success:
+            if isinstance(self.last_exception, ConfigEntryAuthFailed):
+                raise self.last_exception
+            raise ConfigEntryNotReady from self.last_exception
+        if self._stream is None:
+            self._stream = self.hass.async_create_background_task(
+                self.async_run_door_stream(),
+                name=f"{DOMAIN} {self.key} door status stream",
+            )
+
+    async def _async_restore(self) -> None:
+        """Restore what was known about this door before the first refresh."""
+        if stored := await self._store.async_load():
+            self.travel = DoorTravelModel(stored.get("travel"))
+            self.history = DoorHistory(stored.get("history"))
+            if (status := stored.get("status")) is not None:
+                self.data = CoopStatus.from_dict(status, restored=True)
+                self.motion.restore(stored.get("position"))
+                LOGGER.debug(f"Restored door status {self.data}")
+
+    async def async_register_shutdown(self) -> None:
+        """Shut down when Home Assistant stops, closing the session once it closes."""
+        await super().async_register_shutdown()
+
+        async def _async_on_close(_: Event) -> None:
+            self._unsub_close = None
+            await self.client.session.close()
+
+        self._unsub_close = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_on_close
+        )
+
+    async def async_close_session(self) -> None:
+        """Close the session of the controller, once nothing uses it anymore."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        await self.client.session.close()
 
-    config_entry: HenCoopConfigEntry
+    async def async_shutdown(self) -> None:
+        """Stop all work for the controller and write pending state right away."""
+        await super().async_shutdown()
+        for task in (self._stream, self._background_refresh, self._command_accept):
+            if task is not None:
+                task.cancel()
+        self._stream = self._background_refresh = self._command_accept = None
+        self._async_cancel_travel_watch()
+        self.commands.async_cancel()
+        await self.client.async_close()
+        if (fleet := self.hass.data.get(DATA_FLEET)) is not None:
+            fleet.forget(self.key)
+        await self._store.async_save(self._data_to_store())
 
-    async def _async_update_data(self) -> Any:
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the state persisted across restarts."""
+        data: dict[str, Any] = {
+            "travel": self.travel.as_dict(),
+            "history": self.history.as_dict(),
+        }
+        if self.data is not None:
+            data["status"] = self.data.as_dict()
+            data["position"] = self.motion.position
+        return data
+
+    @callback
+    def _async_record_travel(
+        self, direction: DoorDirection, seconds: float | None
+    ) -> None:
+        """Learn from a finished door travel."""
+        LOGGER.debug(f"Door {direction} finished after {seconds} seconds")
+        self.travel.record(direction, seconds)
+        if seconds is None:
+            self._async_record_event(
+                DoorEvent.OPEN_FAILED
+                if direction is DoorDirection.OPENING
+                else DoorEvent.CLOSE_FAILED
+            )
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    async def _async_update_data(self) -> CoopStatus:
         """Update data via library."""
+        client = self.client
+        started = monotonic()
         try:
-            data = await self.config_entry.runtime_data.client.async_door_status()
-            LOGGER.debug(f"API response: {data}")
-            return data  # noqa: TRY300
+            if self.gpio_pins:
+                door, gpio = await asyncio.gather(
+                    client.async_door_status(),
+                    client.async_read_gpio_pins(self.gpio_pins),
+                )
+            else:
+                door, gpio = await client.async_door_status(), None
+            LOGGER.debug(f"API response: {door} {gpio}")
         except HenCoopApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except HenCoopApiClientError as exception:
             raise UpdateFailed(exception) from exception
+        finally:
+            self.last_update_duration = monotonic() - started
+
+        previous = self.data
+        if previous is not None and door is previous.door and gpio is previous.gpio:
+            # Every read came back unchanged, e.g. answered with a 304, keep
+            # the snapshot so the comparison below is a no-op
+            data = previous
+        else:
+            data = CoopStatus(door, gpio)
+        self._async_observe(data.door)
+        self._async_tick_motion()
+        update_interval = self._next_update_interval(data.door)
+        if update_interval != self.update_interval:
+            self.update_interval = update_interval
+            if data == self.data:
+                # Unchanged data notifies nobody, show the new cadence anyway
+                self.async_update_listeners()
+        return data
+
+    def _next_update_interval(self, door: DoorStatus) -> timedelta | None:
+        """Pick the polling cadence for the door state that was just read."""
+        if self.streaming:
+            # The stream only carries the reed sensors, keep polling GPIO pins
+            return IDLE_UPDATE_INTERVAL if self.gpio_pins else None
+
+        now = monotonic()
+        if door.top or door.bottom:
+            self._transit_since = None
+        elif self._transit_since is None:
+            self._transit_since = now
+
+        in_transit = (
+            self._transit_since is not None
+            and now - self._transit_since < FAST_POLL_TRANSIT_TIMEOUT.total_seconds()
+        )
+        if in_transit or self.motion.is_moving or now < self._fast_poll_until:
+            return FAST_UPDATE_INTERVAL
+        return IDLE_UPDATE_INTERVAL
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh, idle ones staggered across the fleet."""
+        interval = self._update_interval_seconds
+        if (
+            self.update_interval == IDLE_UPDATE_INTERVAL
+            and (fleet := self.fleet) is not None
+        ):
+            # Only the schedule is jittered, the cadence shown stays the same
+            self._update_interval_seconds = fleet.spread(
+                self.key, IDLE_UPDATE_INTERVAL
+            ).total_seconds()
+        try:
+            super()._schedule_refresh()
+        finally:
+            self._update_interval_seconds = interval
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Notify listeners, waking keyed ones only if their key changed.
+
+        A listener added with a key of `CoopStatus.changes` as context is
+        only called when that value or the availability changed since the
+        last notification, every other listener is called each time.
+        """
+        changed: set[str] | None = None
+        if (
+            self.data is not None
+            and self._dispatched is not None
+            and self.last_update_success == self._dispatched_success
+        ):
+            changed = self.data.changes(self._dispatched)
+        self._dispatched = self.data
+        self._dispatched_success = self.last_update_success
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or changed is None or context in changed:
+                update_callback()
+        if self.data is not None:
+            # Keep the last known status for the next start
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @property
+    def fleet(self) -> HenCoopFleetScheduler | None:
+        """Return the fleet scheduler if any entry of the controller opted in."""
+        if any(
+            entry.options.get(CONF_FLEET_SCHEDULING) for entry in self.entries.values()
+        ):
+            return async_get_fleet_scheduler(self.hass)
+        return None
+
+    @property
+    def poll_lag(self) -> float | None:
+        """Return seconds the last read waited for a fleet request slot."""
+        if (fleet := self.fleet) is None:
+            return None
+        return fleet.lag.get(self.key)
+
+    @property
+    def gpio_pins(self) -> list[int]:
+        """Return the extra GPIO pins watched by any entry of the controller."""
+        return sorted(
+            {
+                int(pin)
+                for entry in self.entries.values()
+                for pin in entry.options.get(CONF_GPIO_PINS, [])
+            }
+        )
+
+    @property
+    def travel_timeout(self) -> float:
+        """Return the seconds after which a travel counts as stalled."""
+        return min(
+            (
+                entry.options.get(CONF_TRAVEL_TIMEOUT, DOOR_DURATION)
+                for entry in self.entries.values()
+            ),
+            default=DOOR_DURATION,
+        )
+
+    @property
+    def read_rate_limit(self) -> float:
+        """Return the reads per second the controller may receive."""
+        return min(
+            (
+                entry.options.get(CONF_READ_RATE_LIMIT, READ_RATE_LIMIT)
+                for entry in self.entries.values()
+            ),
+            default=READ_RATE_LIMIT,
+        )
+
+    @property
+    def command_rate_limit(self) -> float:
+        """Return the door commands per minute the controller may receive."""
+        return min(
+            (
+                entry.options.get(CONF_COMMAND_RATE_LIMIT, COMMAND_RATE_LIMIT)
+                for entry in self.entries.values()
+            ),
+            default=COMMAND_RATE_LIMIT,
+        )
+
+    @callback
+    def async_start_fast_polling(self) -> None:
+        """Switch to fast polling until the door has settled again."""
+        if self.streaming:
+            return
+        self._fast_poll_until = monotonic() + FAST_POLL_WINDOW.total_seconds()
+        self._transit_since = None
+        self.update_interval = FAST_UPDATE_INTERVAL
+        self._schedule_refresh()
+
+    async def async_open_door(self) -> None:
+        """Open the door and follow its travel."""
+        await self.commands.async_submit(DoorCommand.OPEN)
+
+    async def async_close_door(self) -> None:
+        """Close the door and follow its travel."""
+        await self.commands.async_submit(DoorCommand.CLOSE)
+
+    async def async_stop(self) -> None:
+        """Stop the door and confirm where it came to rest."""
+        await self.commands.async_submit(DoorCommand.STOP)
+
+    @callback
+    def _async_observe(self, door: DoorStatus) -> bool:
+        """
+        Follow the motion and history with a door status just read.
+
+        Returns:
+            Whether the motion or position changed
+
+        """
+        moved = self.motion.observe(door)
+        self.history.observe(door, dt_util.utcnow().timestamp())
+        return moved
+
+    @callback
+    def _async_tick_motion(self) -> None:
+        """End a motion the motor has run out and show it."""
+        if self.motion.tick():
+            self.async_update_listeners()
+
+    @callback
+    def _async_record_event(self, event: DoorEvent) -> None:
+        """Add a command or failure to the door history."""
+        self.history.record(event, dt_util.utcnow().timestamp())
+
+    async def _async_send_command(
+        self, command: DoorCommand
+    ) -> asyncio.Task[None] | None:
+        """Send a command taken from the queue, returning its acceptance."""
+        if command is DoorCommand.OPEN:
+            return await self._async_move_door(DoorDirection.OPENING)
+        if command is DoorCommand.CLOSE:
+            return await self._async_move_door(DoorDirection.CLOSING)
+        await self._async_stop_door()
+        return None
+
+    async def _async_stop_door(self) -> None:
+        """Send a stop command and confirm where the door came to rest."""
+        self._async_record_event(DoorEvent.STOP_SENT)
+        self._async_cancel_travel_watch()
+        if self.command_job is not None:
+            # An open or close still on its way must not land after the stop
+            self.command_job.cancel()
+            self.command_job = None
+        self.motion.stop()
+        self.async_update_listeners()
+        await self.client.async_stop()
+        self.async_start_fast_polling()
+        await self.async_request_refresh()
+
+    async def _async_move_door(self, direction: DoorDirection) -> asyncio.Task[None]:
+        """
+        Send an open or close command and track the resulting motion.
+
+        Returns:
+            Task waiting for the controller to accept the command, then
+            watching the travel
+
+        """
+        client = self.client
+        opening = direction is DoorDirection.OPENING
+        start = (
+            client.async_start_open_door if opening else client.async_start_close_door
+        )
+        duration = self.travel.duration(direction)
+        # Nothing changes until the rate limiter let the command start, while
+        # it waits a stop or the opposite command can still cancel it
+        job = await start(duration=duration, duty_cycle=DOOR_DUTY_CYCLE)
+        self._async_record_event(
+            DoorEvent.OPEN_SENT if opening else DoorEvent.CLOSE_SENT
+        )
+        self._async_cancel_travel_watch()
+        if self.command_job is not None:
+            # The controller follows the newer command
+            self.command_job.cancel()
+        self.command_job = job
+        job.add_done_callback(self._async_command_done)
+        # Show the motion right away instead of after the round trip
+        self.motion.start(direction, duration, DOOR_DUTY_CYCLE)
+        # Keep polling while the controller takes the command and the door
+        # travels, the watch only reads the reed sensors
+        self.async_start_fast_polling()
+        self.async_update_listeners()
+        accept = self._command_accept = self.hass.async_create_background_task(
+            self._async_accept_command(direction, job),
+            name=f"{DOMAIN} {self.key} door {direction} command",
+        )
+        # Retrieve a refusal even if every submitter stopped waiting
+        accept.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return accept
+
+    async def _async_accept_command(
+        self, direction: DoorDirection, job: HenCoopCommandJob
+    ) -> None:
+        """Wait for the controller to accept a command, then watch the travel."""
+        try:
+            async with async_timeout.timeout(COMMAND_ACCEPT_TIMEOUT):
+                await job.async_wait()
+        except TimeoutError:
+            # The controller answers once the motor run is over, the travel
+            # watch follows the door from here
+            LOGGER.debug(f"Door {direction} command accepted, motor running")
+        except asyncio.CancelledError:
+            if not job.cancelled:
+                raise
+            # Stopped or superseded before the controller answered
+            return
+        except HenCoopApiClientError:
+            self._async_record_event(
+                DoorEvent.OPEN_FAILED
+                if direction is DoorDirection.OPENING
+                else DoorEvent.CLOSE_FAILED
+            )
+            if self.command_job is job:
+                self.motion.cancel()
+                self.async_update_listeners()
+            raise
+        if self.command_job is not job:
+            # Stopped or superseded while the controller took it
+            return
+        self._travel_watch = self.hass.async_create_background_task(
+            self._async_watch_travel(direction),
+            name=f"{DOMAIN} {self.key} door {direction} watch",
+        )
+
+    @callback
+    def _async_command_done(self, job: HenCoopCommandJob) -> None:
+        """Log a command that failed after it was handed to the background."""
+        if job.cancelled:
+            return
+        if (exception := job.exception()) is not None and job.elapsed > (
+            COMMAND_ACCEPT_TIMEOUT
+        ):
+            LOGGER.warning(f"Door {job.command} did not complete: {exception}")
+
+    @callback
+    def _async_cancel_travel_watch(self) -> None:
+        """Stop watching a travel that is being superseded."""
+        if self._travel_watch is not None:
+            self._travel_watch.cancel()
+            self._travel_watch = None
+
+    async def _async_watch_travel(self, direction: DoorDirection) -> None:
+        """Stop the motor once the target reed sensor trips or the travel stalls."""
+        client = self.client
+        timeout = min(self.motion.duration, self.travel_timeout)
+        while self.motion.direction is direction:
+            if self.motion.elapsed >= timeout:
+                LOGGER.warning(
+                    f"Door {direction} did not reach its end position within "
+                    f"{timeout} seconds, stopping the motor"
+                )
+                self._travel_watch = None
+                # Report the failed travel, the stop would settle it quietly
+                self.motion.stall()
+                self.async_update_listeners()
+                try:
+                    await self.commands.async_submit(DoorCommand.STOP, supersede=False)
+                except HenCoopApiClientError as exception:
+                    LOGGER.error(f"Failed to stop stalled door: {exception}")
+                return
+
+            await asyncio.sleep(TRAVEL_POLL_INTERVAL.total_seconds())
+            self._async_tick_motion()
+            if self.streaming:
+                # Pushed states are observed as they arrive
+                continue
+            try:
+                door = await client.async_door_status()
+            except HenCoopApiClientError as exception:
+                LOGGER.debug(f"Failed to read door status during travel: {exception}")
+                continue
+            self._async_set_door_status(door)
+
+        self._travel_watch = None
+        # The motion ended without a new command, stop the motor early if the
+        # door is already where it was sent
+        door = self.data.door
+        if (
+            self.motion.direction is None
+            and self.commands.depth == 0
+            and (door.top if direction is DoorDirection.OPENING else door.bottom)
+        ):
+            LOGGER.debug("Door reached its end position, stopping the motor")
+            try:
+                await self.commands.async_submit(DoorCommand.STOP, supersede=False)
+            except HenCoopApiClientError as exception:
+                LOGGER.error(f"Failed to stop door at end position: {exception}")
+
+    @callback
+    def _async_set_door_status(self, door: DoorStatus) -> None:
+        """Publish a door status read outside of a scheduled refresh."""
+        moved = self._async_observe(door)
+        if self.data is not None and door == self.data.door and not self.data.restored:
+            # The travel watch and the stream repeat states several times a
+            # second, only a changed door is worth a write and a new poll
+            if moved:
+                self.async_update_listeners()
+            return
+        # A live status confirms a restored one
+        self.async_set_updated_data(
+            CoopStatus(door)
+            if self.data is None
+            else replace(self.data, door=door, restored=False)
+        )
+
+    async def async_run_door_stream(self) -> None:
+        """Follow door states pushed by the controller, polling while it is down."""
+        client = self.client
+        backoff = STREAM_RECONNECT_MIN.total_seconds()
+        while True:
+            try:
+                async for door in client.async_door_status_events():
+                    if not self.streaming:
+                        LOGGER.debug("Door status stream connected, pausing polling")
+                        self.streaming = True
+                        self.update_interval = None
+                    backoff = STREAM_RECONNECT_MIN.total_seconds()
+                    self._async_set_door_status(door)
+            except HenCoopApiClientError as exception:
+                LOGGER.debug(f"Door status stream unavailable: {exception}")
+
+            if self.streaming:
+                LOGGER.debug("Door status stream lost, resuming polling")
+                self.streaming = False
+                # Catch up on anything missed while reconnecting
+                self.update_interval = FAST_UPDATE_INTERVAL
+                self._schedule_refresh()
+
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))  # noqa: S311
+            backoff = min(backoff * 2, STREAM_RECONNECT_MAX.total_seconds())
@@ -10,17 +10,23 @@ from homeassistant.components.cover import (
     CoverEntityDescription,
     CoverEntityFeature,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 
 from .const import LOGGER
 from .entity import HenCoopEntity
+from .motion import DoorDirection
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import HenCoopDataUpdateCoordinator
     from .data import HenCoopConfigEntry
 
+# Seconds between position estimate updates while the door moves
+MOTION_TICK = 1
+
 ENTITY_DESCRIPTIONS = (
     CoverEntityDescription(
         key="door",
@@ -41,6 +47,7 @@ async def async_setup_entry(
     async_add_entities(
         HenCoopDoorCover(
             coordinator=entry.runtime_data.coordinator,
+            entry=entry,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
@@ -53,55 +60,85 @@ class HenCoopDoorCover(HenCoopEntity, CoverEntity):
     def __init__(
         self,
         coordinator: HenCoopDataUpdateCoordinator,
+        entry: HenCoopConfigEntry,
         entity_description: CoverEntityDescription,
     ) -> None:
         """Initialize the cover class."""
-        super().__init__(coordinator, unique_id_suffix=entity_description.key)
+        super().__init__(coordinator, entry, unique_id_suffix=entity_description.key)
         self.entity_description = entity_description
         self._attr_device_class = CoverDeviceClass.SHUTTER
         self._attr_supported_features = (
             CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP
         )
+        self._unsub_motion_tick: CALLBACK_TYPE | None = None
         LOGGER.debug(f"Cover initialized with unique_id: {self._attr_unique_id}")
 
     @property
     def is_closed(self) -> bool | None:
         """Return if the cover is closed."""
-        if not self.coordinator.data:
+        if self.coordinator.data is None:
             return None
 
-        door_top = self.coordinator.data.get("top", False)
-        door_bottom = self.coordinator.data.get("bottom", False)
-
         # Door is considered closed when bottom sensor is triggered
-        return not door_top and door_bottom
+        return self.coordinator.data.door.is_closed
+
+    @property
+    def current_cover_position(self) -> int | None:
+        """Return the estimated position, 0 is closed and 100 is open."""
+        return self.coordinator.motion.position
 
     @property
     def is_opening(self) -> bool | None:
         """Return if the cover is opening."""
-        # This would require tracking door movement state
-        return None
+        return self.coordinator.motion.direction is DoorDirection.OPENING
 
     @property
     def is_closing(self) -> bool | None:
         """Return if the cover is closing."""
-        # This would require tracking door movement state
-        return None
-
-    async def async_open_cover(self, **kwargs: Any) -> None:
+        return self.coordinator.motion.direction is DoorDirection.CLOSING
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        super()._handle_coordinator_update()
+        self._async_track_motion()
+
+    @callback
+    def _async_track_motion(self, *_: Any) -> None:
+        """Refresh the position estimate every second while the door moves."""
+        if self._unsub_motion_tick is not None:
+            self._unsub_motion_tick()
+            self._unsub_motion_tick = None
+        if self.coordinator.motion.is_moving:
+            self._unsub_motion_tick = async_call_later(
+                self.hass, MOTION_TICK, self._async_motion_tick
+            )
+
+    @callback
+    def _async_motion_tick(self, *_: Any) -> None:
+        """Write the latest position estimate."""
+        self._unsub_motion_tick = None
+        self.async_write_ha_state()
+        self._async_track_motion()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop refreshing the position estimate."""
+        if self._unsub_motion_tick is not None:
+            self._unsub_motion_tick()
+            self._unsub_motion_tick = None
+        await super().async_will_remove_from_hass()
+
+    async def async_open_cover(self, **_: Any) -> None:
         """Open the cover."""
         LOGGER.debug("Opening hen coop door")
-        await self.coordinator.config_entry.runtime_data.client.async_open_door()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_open_door()
 
-    async def async_close_cover(self, **kwargs: Any) -> None:
+    async def async_close_cover(self, **_: Any) -> None:
         """Close the cover."""
         LOGGER.debug("Closing hen coop door")
-        await self.coordinator.config_entry.runtime_data.client.async_close_door()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_close_door()
 
-    async def async_stop_cover(self, **kwargs) -> None:
+    async def async_stop_cover(self, **_: Any) -> None:
         """Stop the cover."""
         LOGGER.debug("Stopping hen coop door")
-        await self.coordinator.config_entry.runtime_data.client.async_stop()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_stop()
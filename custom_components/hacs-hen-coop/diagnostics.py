@@ -0,0 +1,78 @@
+"""Diagnostics support for hacs-hen-coop."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.const import CONF_API_TOKEN, CONF_HOST
+from homeassistant.util import dt as dt_util
+from yarl import URL
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import HenCoopConfigEntry
+
+TO_REDACT = {CONF_API_TOKEN, CONF_HOST}
+
+
+def _redact_host(text: str, host: str | None) -> str:
+    """Return `text` without the controller's host, e.g. in an error message."""
+    return text.replace(host, REDACTED) if host else text
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: HenCoopConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    client = coordinator.client
+    history = coordinator.history
+    now = dt_util.utcnow().timestamp()
+    data = coordinator.data
+    interval = coordinator.update_interval
+    host = URL(coordinator.key).host
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "controller": {
+            "key": REDACTED,
+            "entries": list(coordinator.entries),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": _redact_host(repr(coordinator.last_exception), host)
+            if coordinator.last_exception is not None
+            else None,
+            "update_interval": interval.total_seconds() if interval else None,
+            "last_update_duration": coordinator.last_update_duration,
+            "streaming": coordinator.streaming,
+            "poll_lag": coordinator.poll_lag,
+            "command_queue_depth": coordinator.commands.depth,
+        },
+        "status": None
+        if data is None
+        else {**data.as_dict(), "restored": data.restored},
+        "motion": {
+            "direction": coordinator.motion.direction,
+            "position": coordinator.motion.position,
+        },
+        "travel": coordinator.travel.as_dict(),
+        "history": {
+            "events": len(history),
+            "last_travel_time": history.last_travel_time,
+            "cycles_today": history.cycles_today(now),
+            "failed_closes_today": history.failed_closes_today(now),
+            "time_open_today": history.time_open_today(now),
+        },
+        "metrics": {
+            endpoint: metrics.as_dict()
+            for endpoint, metrics in client.metrics.endpoints.items()
+        },
+        "rate_limit_waits": {
+            budget: metrics.as_dict()
+            for budget, metrics in client.metrics.waits.items()
+        },
+        "traces": client.tracer.as_list() if client.tracer is not None else [],
+    }
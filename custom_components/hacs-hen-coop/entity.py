@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION, DOMAIN, LOGGER
 from .coordinator import HenCoopDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from .data import HenCoopConfigEntry
+
 
 class HenCoopEntity(CoordinatorEntity[HenCoopDataUpdateCoordinator]):
     """HenCoopEntity class."""
@@ -17,21 +22,34 @@ class HenCoopEntity(CoordinatorEntity[HenCoopDataUpdateCoordinator]):
     def __init__(
         self,
         coordinator: HenCoopDataUpdateCoordinator,
+        entry: HenCoopConfigEntry,
         unique_id_suffix: str | None = None,
+        context: Any = None,
     ) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
-        # Allow overriding the unique_id with a suffix
+        """
+        Initialize.
+
+        A `context` naming a key of `CoopStatus.changes` limits coordinator
+        updates to those changing that key.
+        """
+        super().__init__(coordinator, context)
+        # The coordinator may be shared with other entries of the same
+        # controller, ids stay bound to the entry that created the entity
         if unique_id_suffix:
-            self._attr_unique_id = (
-                f"{coordinator.config_entry.entry_id}_{unique_id_suffix}"
-            )
+            self._attr_unique_id = f"{entry.entry_id}_{unique_id_suffix}"
             LOGGER.debug(f"Created entity with unique_id: {self._attr_unique_id}")
         else:
-            self._attr_unique_id = coordinator.config_entry.entry_id
+            self._attr_unique_id = entry.entry_id
 
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
+            identifiers={(DOMAIN, entry.entry_id)},
             name="Hen Coop Controller",
             manufacturer="HACS",
         )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag a state restored from before a restart until it is confirmed."""
+        if self.coordinator.data is not None and self.coordinator.data.restored:
+            return {"restored": True}
+        return None
@@ -0,0 +1,69 @@
+"""Fleet scheduling for many HenCoop controllers."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, FLEET_JITTER, FLEET_MAX_CONCURRENT
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from datetime import timedelta
+
+    from homeassistant.core import HomeAssistant
+
+DATA_FLEET: HassKey[HenCoopFleetScheduler] = HassKey(f"{DOMAIN}_fleet")
+
+
+class HenCoopFleetScheduler:
+    """
+    Spread polls of many controllers and cap their concurrent requests.
+
+    Shared by every controller whose config entries opt in, keyed by the
+    controller. Each controller starts polling at a random phase of its
+    interval and every later interval is jittered, so controllers set up
+    together do not stay in lockstep. A slot is held for a single read
+    attempt, never while a read backs off before its retry.
+    """
+
+    def __init__(self, max_concurrent: int = FLEET_MAX_CONCURRENT) -> None:
+        """Initialize."""
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Seconds the last read of each controller waited for a free slot
+        self.lag: dict[str, float] = {}
+        self._phased: set[str] = set()
+
+    @asynccontextmanager
+    async def async_slot(self, key: str) -> AsyncIterator[None]:
+        """Hold one of the fleet's request slots for one read of a controller."""
+        queued = monotonic()
+        async with self._semaphore:
+            self.lag[key] = monotonic() - queued
+            yield
+
+    def spread(self, key: str, interval: timedelta) -> timedelta:
+        """Return the interval a controller waits, staggered across the fleet."""
+        if key not in self._phased:
+            self._phased.add(key)
+            return interval * random.uniform(FLEET_JITTER, 1)  # noqa: S311
+        return interval * random.uniform(1 - FLEET_JITTER, 1 + FLEET_JITTER)  # noqa: S311
+
+    def forget(self, key: str) -> None:
+        """Drop the state of a controller no entry uses anymore."""
+        self.lag.pop(key, None)
+        self._phased.discard(key)
+
+
+@callback
+def async_get_fleet_scheduler(hass: HomeAssistant) -> HenCoopFleetScheduler:
+    """Return the scheduler shared by all entries."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = HenCoopFleetScheduler()
+    return fleet
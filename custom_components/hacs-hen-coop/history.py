@@ -0,0 +1,184 @@
+"""Door event history for hacs-hen-coop."""
+
+from __future__ import annotations
+
+import base64
+from array import array
+from datetime import timedelta
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .models import DoorStatus
+
+# Events kept per controller, enough for a busy day of door cycles
+HISTORY_SIZE = 1024
+
+
+class DoorEvent(IntEnum):
+    """Something that happened to the door, stored as one byte."""
+
+    TOP_REACHED = 1
+    TOP_LEFT = 2
+    BOTTOM_REACHED = 3
+    BOTTOM_LEFT = 4
+    OPEN_SENT = 5
+    CLOSE_SENT = 6
+    STOP_SENT = 7
+    OPEN_FAILED = 8
+    CLOSE_FAILED = 9
+
+
+class DoorHistory:
+    """
+    Bounded history of reed transitions and commands with running statistics.
+
+    Events live in two preallocated arrays used as a ring buffer, the oldest
+    event is overwritten once `HISTORY_SIZE` is reached. Statistics are
+    updated with every event, so reading them never scans the history. After
+    a restart they are rebuilt by replaying the stored events once.
+    """
+
+    def __init__(
+        self, data: dict[str, Any] | None = None, size: int = HISTORY_SIZE
+    ) -> None:
+        """Initialize from previously stored events."""
+        self._when = array("d", bytes(8 * size))
+        self._kind = array("B", bytes(size))
+        self._size = size
+        self._next = 0
+        self._count = 0
+        self._door: tuple[bool, bool] | None = None
+        # Local day the daily statistics are counted for
+        self._day_start = 0.0
+        self._day_end = 0.0
+        self._cycles_today = 0
+        self._failed_closes_today = 0
+        self._open_today = 0.0
+        # Statistics carried between events
+        self.last_travel_time: float | None = None
+        self._open_since: float | None = None
+        self._left_top_at: float | None = None
+        self._left_bottom_at: float | None = None
+        self._reached_top = False
+        if data:
+            self._load(data)
+
+    def __len__(self) -> int:
+        """Return the number of events kept."""
+        return self._count
+
+    def __iter__(self) -> Iterator[tuple[float, DoorEvent]]:
+        """Yield the events kept, oldest first, as timestamp and event."""
+        start = (self._next - self._count) % self._size
+        for offset in range(self._count):
+            index = (start + offset) % self._size
+            yield self._when[index], DoorEvent(self._kind[index])
+
+    def record(self, event: DoorEvent, when: float) -> None:
+        """Append an event that happened at the given timestamp."""
+        self._when[self._next] = when
+        self._kind[self._next] = event
+        self._next = (self._next + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        self._apply(event, when)
+
+    def observe(self, door: DoorStatus, when: float) -> bool:
+        """
+        Record the reed transitions between the last and the given status.
+
+        Returns:
+            Whether any transition was recorded
+
+        """
+        previous, self._door = self._door, (door.top, door.bottom)
+        if previous is None or previous == self._door:
+            return False
+        if door.top != previous[0]:
+            self.record(DoorEvent.TOP_REACHED if door.top else DoorEvent.TOP_LEFT, when)
+        if door.bottom != previous[1]:
+            self.record(
+                DoorEvent.BOTTOM_REACHED if door.bottom else DoorEvent.BOTTOM_LEFT,
+                when,
+            )
+        return True
+
+    def cycles_today(self, now: float) -> int:
+        """Return open and close cycles completed since local midnight."""
+        self._roll(now)
+        return self._cycles_today
+
+    def failed_closes_today(self, now: float) -> int:
+        """Return close commands that failed or stalled since local midnight."""
+        self._roll(now)
+        return self._failed_closes_today
+
+    def time_open_today(self, now: float) -> float:
+        """Return seconds the door was not closed since local midnight."""
+        self._roll(now)
+        if self._open_since is None:
+            return self._open_today
+        return self._open_today + now - max(self._open_since, self._day_start)
+
+    def _apply(self, event: DoorEvent, when: float) -> None:
+        """Update the statistics with one event."""
+        self._roll(when)
+        if event is DoorEvent.BOTTOM_LEFT:
+            self._left_bottom_at = self._open_since = when
+        elif event is DoorEvent.TOP_LEFT:
+            self._left_top_at = when
+        elif event is DoorEvent.TOP_REACHED:
+            if self._left_bottom_at is not None:
+                self.last_travel_time = when - self._left_bottom_at
+            self._left_bottom_at = None
+            self._reached_top = True
+        elif event is DoorEvent.BOTTOM_REACHED:
+            if self._left_top_at is not None:
+                self.last_travel_time = when - self._left_top_at
+            if self._open_since is not None:
+                self._open_today += when - max(self._open_since, self._day_start)
+            if self._reached_top:
+                self._cycles_today += 1
+            self._left_top_at = self._left_bottom_at = self._open_since = None
+            self._reached_top = False
+        elif event is DoorEvent.CLOSE_FAILED:
+            self._failed_closes_today += 1
+
+    def _roll(self, when: float) -> None:
+        """Start counting a new local day once `when` is past the current one."""
+        if when < self._day_end:
+            return
+        day_start = dt_util.start_of_local_day(
+            dt_util.as_local(dt_util.utc_from_timestamp(when))
+        )
+        self._day_start = day_start.timestamp()
+        self._day_end = (day_start + timedelta(days=1)).timestamp()
+        self._cycles_today = self._failed_closes_today = 0
+        self._open_today = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the ring buffer for storage, packed as base64 arrays."""
+        return {
+            "when": base64.b64encode(self._when.tobytes()).decode(),
+            "kind": base64.b64encode(self._kind.tobytes()).decode(),
+            "next": self._next,
+            "count": self._count,
+            "door": self._door,
+        }
+
+    def _load(self, data: dict[str, Any]) -> None:
+        """Replay stored events to rebuild the statistics."""
+        when = array("d")
+        when.frombytes(base64.b64decode(data["when"]))
+        kind = base64.b64decode(data["kind"])
+        size, count = len(when), data["count"]
+        start = (data["next"] - count) % size
+        for offset in range(count):
+            index = (start + offset) % size
+            self.record(DoorEvent(kind[index]), when[index])
+        if (door := data.get("door")) is not None:
+            self._door = (door[0], door[1])
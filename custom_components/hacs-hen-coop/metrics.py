@@ -0,0 +1,101 @@
+"""Request metrics for the Hen Coop API client."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections import Counter
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket
+# takes everything slower
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    120,
+    math.inf,
+)
+
+
+class EndpointMetrics:
+    """
+    Request count, errors and latency histogram of one API endpoint.
+
+    Latencies are counted in fixed buckets, so memory stays constant and
+    percentiles are reported as the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = 0
+        # Failed requests by the class of the underlying exception
+        self.errors: Counter[str] = Counter()
+        self._buckets = [0] * len(LATENCY_BUCKETS)
+        self._max = 0.0
+
+    def observe(self, latency: float, error: BaseException | None = None) -> None:
+        """Record one request that took `latency` seconds."""
+        self.requests += 1
+        self._buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self._max = max(self._max, latency)
+        if error is not None:
+            self.errors[type(error).__name__] += 1
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the latency in seconds below which `percentile` % fell."""
+        if not self.requests:
+            return None
+        rank = math.ceil(percentile / 100 * self.requests)
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self._buckets, strict=True):
+            seen += count
+            if seen >= rank:
+                return min(bound, self._max)
+        return self._max
+
+    def as_dict(self) -> dict[str, float | int | dict[str, int] | None]:
+        """Return a summary of the endpoint."""
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class HenCoopMetrics:
+    """Request metrics of one controller, by endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        # Seconds requests waited for the rate limiter, by budget, in the same
+        # histogram as request latencies
+        self.waits: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint, e.g. `/door-status`."""
+        if (metrics := self.endpoints.get(name)) is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def wait(self, budget: str) -> EndpointMetrics:
+        """Return the rate limiter waits of a budget, e.g. `read`."""
+        if (metrics := self.waits.get(budget)) is None:
+            metrics = self.waits[budget] = EndpointMetrics()
+        return metrics
+
+    @property
+    def errors(self) -> int:
+        """Return the failed requests across all endpoints."""
+        return sum(metrics.errors.total() for metrics in self.endpoints.values())
@@ -0,0 +1,119 @@
+"""Models of the states reported by a HenCoop controller."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class DoorStatus:
+    """States of the reed sensors at both end positions of the door."""
+
+    top: bool
+    bottom: bool
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> DoorStatus:
+        """Decode a door status payload, raising if it is malformed."""
+        return cls(top=bool(data["top"]), bottom=bool(data["bottom"]))
+
+    @property
+    def is_open(self) -> bool:
+        """Return if only the top sensor is triggered."""
+        return self.top and not self.bottom
+
+    @property
+    def is_closed(self) -> bool:
+        """Return if only the bottom sensor is triggered."""
+        return self.bottom and not self.top
+
+
+@dataclass(frozen=True, slots=True)
+class GpioReading:
+    """Logic level of a single GPIO pin."""
+
+    pin: int
+    value: int
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> GpioReading:
+        """Decode a single pin payload, raising if it is malformed."""
+        return cls(pin=int(data["pin"]), value=int(data["value"]))
+
+
+@dataclass(frozen=True, slots=True)
+class GpioBank:
+    """Logic levels of several GPIO pins, bit `pin` is set for a high pin."""
+
+    mask: int
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> GpioBank:
+        """Decode a `{"pins": {"4": 1}}` payload, raising if it is malformed."""
+        mask = 0
+        for pin, value in data["pins"].items():
+            if value:
+                mask |= 1 << int(pin)
+        return cls(mask)
+
+    def is_high(self, pin: int) -> bool:
+        """Return if the pin reads high."""
+        return bool(self.mask >> pin & 1)
+
+
+@dataclass(frozen=True, slots=True)
+class CoopStatus:
+    """Everything polled from one controller."""
+
+    door: DoorStatus
+    # None unless extra GPIO pins are watched
+    gpio: GpioBank | None = None
+    # Whether this is the status stored before a restart, not yet confirmed
+    restored: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], *, restored: bool = False) -> CoopStatus:
+        """Rebuild a status from storage."""
+        gpio = data.get("gpio")
+        return cls(
+            door=DoorStatus(top=data["top"], bottom=data["bottom"]),
+            gpio=None if gpio is None else GpioBank(gpio),
+            restored=restored,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the status for storage."""
+        return {
+            "top": self.door.top,
+            "bottom": self.door.bottom,
+            "gpio": None if self.gpio is None else self.gpio.mask,
+        }
+
+    def changes(self, previous: CoopStatus) -> set[str] | None:
+        """
+        Return the keys whose value differs from a previous status.
+
+        Keys are `top`, `bottom` and `gpio_<pin>`. None means the statuses
+        are not comparable key by key and everything may have changed.
+        """
+        if (self.gpio is None) != (previous.gpio is None) or (
+            self.restored != previous.restored
+        ):
+            return None
+        keys = {
+            key
+            for key, value, old in (
+                ("top", self.door.top, previous.door.top),
+                ("bottom", self.door.bottom, previous.door.bottom),
+            )
+            if value != old
+        }
+        if self.gpio is not None and previous.gpio is not None:
+            flipped = self.gpio.mask ^ previous.gpio.mask
+            keys.update(
+                f"gpio_{pin}"
+                for pin in range(flipped.bit_length())
+                if flipped >> pin & 1
+            )
+        return keys
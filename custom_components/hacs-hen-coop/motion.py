@@ -0,0 +1,165 @@
+"""Door motion tracking for hacs-hen-coop."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from time import monotonic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .models import DoorStatus
+
+# Seconds after the motor run ends in which a poll may still confirm the end
+MOTION_GRACE = 5
+
+
+class DoorDirection(StrEnum):
+    """Direction the door is travelling in."""
+
+    OPENING = "opening"
+    CLOSING = "closing"
+
+
+class DoorMotionTracker:
+    """
+    Track door travel between the reed sensors.
+
+    The tracker is started optimistically when a command is sent, estimates the
+    position from the elapsed share of the expected travel time and snaps to
+    ground truth as soon as a reed sensor confirms an end position.
+
+    `on_travel` is called with the travel time when a reed sensor confirms a
+    full end-to-end travel, or with None when the travel stalled: the owner
+    gave up on it, or `tick` found the motor ran out its duration without the
+    target sensor tripping. Reading the state never changes it, the owner
+    calls `tick` while the door moves.
+    """
+
+    def __init__(
+        self,
+        on_travel: Callable[[DoorDirection, float | None], None] | None = None,
+    ) -> None:
+        """Initialize."""
+        self._on_travel = on_travel
+        self.direction: DoorDirection | None = None
+        self.duration = 0.0
+        self.duty_cycle = 0
+        self._started = 0.0
+        # Position (0 closed - 100 open) when the current motion started
+        self._start_position: float | None = None
+        # Last known position while the door is not moving
+        self._position: float | None = None
+
+    @property
+    def is_moving(self) -> bool:
+        """Return if the door is believed to be moving."""
+        return self.direction is not None
+
+    @property
+    def elapsed(self) -> float:
+        """Return seconds since the current motion started."""
+        return monotonic() - self._started
+
+    @property
+    def position(self) -> int | None:
+        """Return the estimated position, 0 is closed and 100 is open."""
+        if self.is_moving:
+            return round(self._estimate())
+        if self._position is None:
+            return None
+        return round(self._position)
+
+    def start(self, direction: DoorDirection, duration: float, duty_cycle: int) -> None:
+        """Record that a door command was sent."""
+        self._start_position = self.position
+        self.direction = direction
+        self.duration = duration
+        self.duty_cycle = duty_cycle
+        self._started = monotonic()
+
+    def tick(self) -> bool:
+        """
+        End a motion the motor has run out without a sensor confirming.
+
+        Returns:
+            Whether the motion ended
+
+        """
+        if self.direction is None or self.elapsed < self.duration + MOTION_GRACE:
+            return False
+        self.stall()
+        return True
+
+    def stall(self) -> None:
+        """Record that the door did not reach its end position and stopped."""
+        if self.direction is None:
+            return
+        direction = self.direction
+        self._settle(self._estimate())
+        if self._on_travel is not None:
+            self._on_travel(direction, None)
+
+    def restore(self, position: int | None) -> None:
+        """Restore the position the door rested at before a restart."""
+        if self.direction is None:
+            self._position = position
+
+    def stop(self) -> None:
+        """Record that the door was stopped where it is."""
+        if self.direction is not None:
+            self._settle(self._estimate())
+
+    def cancel(self) -> None:
+        """Forget a motion whose command never reached the controller."""
+        if self.direction is not None:
+            self._settle(self._start_position)
+
+    def observe(self, door: DoorStatus) -> bool:
+        """
+        Snap to the end position reported by the reed sensors.
+
+        Returns:
+            Whether the motion or position changed
+
+        """
+        if door.top and self.direction is not DoorDirection.CLOSING:
+            return self._confirm(100)
+        if door.bottom and self.direction is not DoorDirection.OPENING:
+            return self._confirm(0)
+        if self.direction is None and self._position in (0, 100):
+            # Moved away from an end position without a command we know of
+            self._position = None
+            return True
+        return False
+
+    def _confirm(self, position: int) -> bool:
+        """End the current motion at an end position confirmed by a sensor."""
+        direction = self.direction
+        if direction is None and self._position == position:
+            return False
+        # Only a travel from the opposite end position tells the travel time
+        full_travel = self._start_position == 100 - position
+        elapsed = self.elapsed
+        self._settle(position)
+        if direction is not None and full_travel and self._on_travel is not None:
+            self._on_travel(direction, elapsed)
+        return True
+
+    def _settle(self, position: float | None) -> None:
+        """End the current motion at the given position."""
+        self.direction = None
+        self._position = position
+
+    def _estimate(self) -> float:
+        """Estimate the position from the elapsed share of the travel time."""
+        progress = min(self.elapsed / self.duration, 1) if self.duration else 1
+        if self.direction is DoorDirection.OPENING:
+            start = 0 if self._start_position is None else self._start_position
+            estimate = start + (100 - start) * progress
+        else:
+            start = 100 if self._start_position is None else self._start_position
+            estimate = start - start * progress
+        # Only a reed sensor may confirm a fully open or closed door
+        return min(max(estimate, 1), 99)
@@ -0,0 +1,95 @@
+"""Request rate limiting for the Hen Coop API client."""
+
+from __future__ import annotations
+
+import asyncio
+from enum import StrEnum
+from time import monotonic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .metrics import HenCoopMetrics
+
+# Default budgets: reads per second, enough for polling the door and the GPIO
+# pins while a travel is followed closely, and motor commands per minute
+READ_RATE_LIMIT = 10
+COMMAND_RATE_LIMIT = 20
+# Requests a budget lets through at once after being idle
+READ_BURST = 20
+COMMAND_BURST = 3
+
+
+class RequestBudget(StrEnum):
+    """Budget a request is paid from."""
+
+    READ = "read"
+    COMMAND = "command"
+
+
+class TokenBucket:
+    """
+    Let requests through at `rate` per second, with bursts of up to `burst`.
+
+    Waiting requests are served in arrival order. A request cancelled while
+    waiting takes no token.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize with a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> float:
+        """
+        Take a token, waiting until one is available.
+
+        Returns:
+            Seconds waited
+
+        """
+        started = monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+        return monotonic() - started
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class HenCoopRateLimiter:
+    """
+    Separate read and motor command budgets of one controller.
+
+    Commands never wait for the read budget, so a burst of status reads
+    cannot delay them. Stop requests bypass both budgets.
+    """
+
+    def __init__(self, metrics: HenCoopMetrics) -> None:
+        """Initialize with the default budgets."""
+        self._metrics = metrics
+        self._buckets = {
+            RequestBudget.READ: TokenBucket(READ_RATE_LIMIT, READ_BURST),
+            RequestBudget.COMMAND: TokenBucket(COMMAND_RATE_LIMIT / 60, COMMAND_BURST),
+        }
+
+    def configure(self, read_rate: float, command_rate: float) -> None:
+        """Set reads per second and commands per minute."""
+        self._buckets[RequestBudget.READ].rate = read_rate
+        self._buckets[RequestBudget.COMMAND].rate = command_rate / 60
+
+    async def async_acquire(self, budget: RequestBudget | None) -> None:
+        """Wait until the budget allows one more request, None bypasses it."""
+        if budget is None:
+            return
+        waited = await self._buckets[budget].async_acquire()
+        self._metrics.wait(budget).observe(waited)
@@ -2,30 +2,196 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
-from .const import LOGGER
+from .const import LOGGER, METRICS_UPDATE_INTERVAL
 from .entity import HenCoopEntity
+from .ratelimit import RequestBudget
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime, timedelta
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
     from .coordinator import HenCoopDataUpdateCoordinator
     from .data import HenCoopConfigEntry
 
+
+@dataclass(frozen=True, kw_only=True)
+class HenCoopSensorEntityDescription(SensorEntityDescription):
+    """Describes a HenCoop sensor."""
+
+    value_fn: Callable[[HenCoopDataUpdateCoordinator], StateType]
+    attributes_fn: Callable[[HenCoopDataUpdateCoordinator], dict[str, Any]] | None = (
+        None
+    )
+    # Write the state on this interval too, not only on coordinator updates
+    update_interval: timedelta | None = None
+
+
+def _poll_interval(coordinator: HenCoopDataUpdateCoordinator) -> StateType:
+    """Return the current polling cadence in seconds."""
+    if coordinator.update_interval is None:
+        return None
+    return coordinator.update_interval.total_seconds()
+
+
+def _cycles_today(coordinator: HenCoopDataUpdateCoordinator) -> StateType:
+    """Return door cycles completed since local midnight."""
+    return coordinator.history.cycles_today(dt_util.utcnow().timestamp())
+
+
+def _time_open_today(coordinator: HenCoopDataUpdateCoordinator) -> StateType:
+    """Return seconds the door was not closed since local midnight."""
+    return coordinator.history.time_open_today(dt_util.utcnow().timestamp())
+
+
+def _failed_closes_today(coordinator: HenCoopDataUpdateCoordinator) -> StateType:
+    """Return close commands that failed or stalled since local midnight."""
+    return coordinator.history.failed_closes_today(dt_util.utcnow().timestamp())
+
+
+def _latency_sensor(
+    endpoint: str, label: str, *, enabled: bool = False
+) -> HenCoopSensorEntityDescription:
+    """Describe the p95 latency of an API endpoint, with more in attributes."""
+
+    def _p95(coordinator: HenCoopDataUpdateCoordinator) -> StateType:
+        latency = coordinator.client.metrics.endpoint(endpoint).percentile(95)
+        return None if latency is None else round(latency * 1000, 1)
+
+    return HenCoopSensorEntityDescription(
+        key=f"{endpoint.strip('/').replace('-', '_')}_latency",
+        name=f"Hen Coop {label} Latency",
+        icon="mdi:speedometer",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=enabled,
+        value_fn=_p95,
+        attributes_fn=lambda coordinator: coordinator.client.metrics.endpoint(
+            endpoint
+        ).as_dict(),
+        update_interval=METRICS_UPDATE_INTERVAL,
+    )
+
+
+def _wait_sensor(budget: str, label: str) -> HenCoopSensorEntityDescription:
+    """Describe the p95 rate limiter wait of a budget, with more in attributes."""
+
+    def _p95(coordinator: HenCoopDataUpdateCoordinator) -> StateType:
+        wait = coordinator.client.metrics.wait(budget).percentile(95)
+        return None if wait is None else round(wait * 1000, 1)
+
+    return HenCoopSensorEntityDescription(
+        key=f"{budget}_rate_limit_wait",
+        name=f"Hen Coop {label} Rate Limit Wait",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=_p95,
+        attributes_fn=lambda coordinator: coordinator.client.metrics.wait(
+            budget
+        ).as_dict(),
+        update_interval=METRICS_UPDATE_INTERVAL,
+    )
+
+
 ENTITY_DESCRIPTIONS = (
-    SensorEntityDescription(
-        key="top",
-        name="Hen Coop Door Top Sensor",
-        icon="mdi:door",
+    HenCoopSensorEntityDescription(
+        key="poll_interval",
+        name="Hen Coop Poll Interval",
+        icon="mdi:timer-sync-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_poll_interval,
+    ),
+    HenCoopSensorEntityDescription(
+        key="poll_lag",
+        name="Hen Coop Poll Lag",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.poll_lag,
+    ),
+    HenCoopSensorEntityDescription(
+        key="command_queue_depth",
+        name="Hen Coop Command Queue Depth",
+        icon="mdi:tray-full",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.commands.depth,
+    ),
+    HenCoopSensorEntityDescription(
+        key="last_travel_time",
+        name="Hen Coop Last Travel Time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: coordinator.history.last_travel_time,
     ),
-    SensorEntityDescription(
-        key="bottom",
-        name="Hen Coop Door Bottom Sensor",
-        icon="mdi:door",
+    HenCoopSensorEntityDescription(
+        key="cycles_today",
+        name="Hen Coop Door Cycles Today",
+        icon="mdi:swap-vertical",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=_cycles_today,
+        update_interval=METRICS_UPDATE_INTERVAL,
+    ),
+    HenCoopSensorEntityDescription(
+        key="time_open_today",
+        name="Hen Coop Time Open Today",
+        icon="mdi:door-open",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        value_fn=_time_open_today,
+        update_interval=METRICS_UPDATE_INTERVAL,
+    ),
+    HenCoopSensorEntityDescription(
+        key="failed_closes_today",
+        name="Hen Coop Failed Closes Today",
+        icon="mdi:door-closed-lock",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=_failed_closes_today,
+        update_interval=METRICS_UPDATE_INTERVAL,
+    ),
+    _latency_sensor("/door-status", "Door Status", enabled=True),
+    _latency_sensor("/gpio", "GPIO"),
+    _latency_sensor("/open-door", "Open Door"),
+    _latency_sensor("/close-door", "Close Door"),
+    _latency_sensor("/stop", "Stop"),
+    _wait_sensor(RequestBudget.READ, "Read"),
+    _wait_sensor(RequestBudget.COMMAND, "Command"),
+    HenCoopSensorEntityDescription(
+        key="request_errors",
+        name="Hen Coop Request Errors",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.client.metrics.errors,
+        update_interval=METRICS_UPDATE_INTERVAL,
     ),
 )
 
@@ -37,31 +203,55 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     async_add_entities(
-        HenCoopDoorSensor(
+        HenCoopSensor(
             coordinator=entry.runtime_data.coordinator,
+            entry=entry,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
     )
 
 
-class HenCoopDoorSensor(HenCoopEntity, SensorEntity):
-    """Hen Coop Door Sensor class."""
+class HenCoopSensor(HenCoopEntity, SensorEntity):
+    """Hen Coop Sensor class."""
+
+    entity_description: HenCoopSensorEntityDescription
+    # Request metrics change with every request, keep them out of the recorder
+    _unrecorded_attributes = frozenset({"requests", "errors", "p50", "p95", "p99"})
 
     def __init__(
         self,
         coordinator: HenCoopDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entry: HenCoopConfigEntry,
+        entity_description: HenCoopSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
         # Pass the entity_description key as unique_id_suffix to the parent class
-        super().__init__(coordinator, unique_id_suffix=entity_description.key)
-        self.entity_description = entity_description
-        # Use proper type for _attr_name (str or None)
+        super().__init__(coordinator, entry, unique_id_suffix=entity_description.key)
         self.entity_description = entity_description
         LOGGER.debug(f"Sensor initialized with unique_id: {self._attr_unique_id}")
 
     @property
-    def native_value(self) -> bool | None:
+    def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        return self.coordinator.data.get(self.entity_description.key)
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes of the sensor."""
+        if self.entity_description.attributes_fn is None:
+            return super().extra_state_attributes
+        return self.entity_description.attributes_fn(self.coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state periodically if the sensor asks for it."""
+        await super().async_added_to_hass()
+        if (interval := self.entity_description.update_interval) is not None:
+            self.async_on_remove(
+                async_track_time_interval(self.hass, self._async_interval, interval)
+            )
+
+    @callback
+    def _async_interval(self, _: datetime) -> None:
+        """Write the latest value."""
+        self.async_write_ha_state()
@@ -0,0 +1,97 @@
+"""Services for hacs-hen-coop."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.helpers import config_validation as cv
+
+from .api import HenCoopApiClientError
+from .commands import DoorCommand
+from .const import DOMAIN, GROUP_COMMAND_CONCURRENCY, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .data import HenCoopConfigEntry
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+SERVICE_OPEN_ALL = "open_all"
+SERVICE_CLOSE_ALL = "close_all"
+SERVICE_STOP_ALL = "stop_all"
+
+SERVICE_COMMANDS = {
+    SERVICE_OPEN_ALL: DoorCommand.OPEN,
+    SERVICE_CLOSE_ALL: DoorCommand.CLOSE,
+    SERVICE_STOP_ALL: DoorCommand.STOP,
+}
+
+SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services acting on all configured coops at once."""
+
+    async def _async_handle_group_command(call: ServiceCall) -> ServiceResponse:
+        """Send a door command to every selected coop concurrently."""
+        command = SERVICE_COMMANDS[call.service]
+        entries: list[HenCoopConfigEntry] = hass.config_entries.async_loaded_entries(
+            DOMAIN
+        )
+        results: dict[str, dict[str, Any]] = {}
+        if wanted := call.data.get(ATTR_CONFIG_ENTRY_ID):
+            loaded = {entry.entry_id for entry in entries}
+            for entry_id in dict.fromkeys(wanted):
+                if entry_id not in loaded:
+                    LOGGER.warning(f"Door {command} skipped {entry_id}, not loaded")
+                    results[entry_id] = {"success": False, "error": "Not loaded"}
+            entries = [entry for entry in entries if entry.entry_id in wanted]
+
+        semaphore = asyncio.Semaphore(GROUP_COMMAND_CONCURRENCY)
+
+        async def _async_send(entry: HenCoopConfigEntry) -> None:
+            commands = entry.runtime_data.coordinator.commands
+            async with semaphore:
+                accepted = await commands.async_send(command)
+            # Only sending is limited, the controllers accept concurrently
+            if accepted is not None:
+                await asyncio.shield(accepted)
+
+        # One coop failing in any way must not hide how the others went
+        outcomes = await asyncio.gather(
+            *(_async_send(entry) for entry in entries), return_exceptions=True
+        )
+        for entry, outcome in zip(entries, outcomes, strict=True):
+            if outcome is None:
+                results[entry.entry_id] = {"title": entry.title, "success": True}
+                continue
+            if isinstance(outcome, HenCoopApiClientError):
+                LOGGER.warning(f"Door {command} failed for {entry.title}: {outcome}")
+            else:
+                LOGGER.error(
+                    f"Door {command} failed for {entry.title}", exc_info=outcome
+                )
+            results[entry.entry_id] = {
+                "title": entry.title,
+                "success": False,
+                "error": str(outcome) or type(outcome).__name__,
+            }
+        return {"results": results}
+
+    for service in SERVICE_COMMANDS:
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            _async_handle_group_command,
+            schema=SERVICE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
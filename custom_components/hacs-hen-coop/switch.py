@@ -34,6 +34,7 @@ async def async_setup_entry(
     async_add_entities(
         HenCoopDoorSwitch(
             coordinator=entry.runtime_data.coordinator,
+            entry=entry,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
@@ -46,33 +47,28 @@ class HenCoopDoorSwitch(HenCoopEntity, SwitchEntity):
     def __init__(
         self,
         coordinator: HenCoopDataUpdateCoordinator,
+        entry: HenCoopConfigEntry,
         entity_description: SwitchEntityDescription,
     ) -> None:
         """Initialize the switch class."""
         # Pass the entity_description key as unique_id_suffix to the parent class
-        super().__init__(coordinator, unique_id_suffix=entity_description.key)
+        super().__init__(coordinator, entry, unique_id_suffix=entity_description.key)
         self.entity_description = entity_description
         LOGGER.debug(f"Switch initialized with unique_id: {self._attr_unique_id}")
 
     @property
-    async def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        door_state = (
-            await self.coordinator.config_entry.runtime_data.client.async_door_status()
-        )
-        door_top = door_state.get("top", False)
-        door_bottom = door_state.get("bottom", False)
+        if self.coordinator.data is None:
+            return None
 
-        # Door is considered "on" when top sensor is triggered but bottom isn't
-        # This indicates the door is open
-        return door_top and not door_bottom
+        # On whenever the door cover is not closed, so both always agree
+        return not self.coordinator.data.door.is_closed
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
-        await self.coordinator.config_entry.runtime_data.client.async_open_door()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_open_door()
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
-        await self.coordinator.config_entry.runtime_data.client.async_close_door()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_close_door()
@@ -0,0 +1,157 @@
+"""Request tracing for the Hen Coop API client."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from types import SimpleNamespace
+
+# Requests whose traces are kept
+TRACE_SIZE = 50
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """Timings in seconds of the phases of one request."""
+
+    method: str
+    url: str
+    # Wall clock time the request started at
+    started: float
+    # Waiting for a free connection of the connector
+    queued: float | None = None
+    dns: float | None = None
+    # TCP and, for https, TLS handshake of a new connection
+    connect: float | None = None
+    reused_connection: bool = False
+    # Start of the request until its headers were sent
+    sent: float | None = None
+    # Headers sent until the response headers arrived, the controller's think
+    # time plus one round trip
+    wait: float | None = None
+    total: float | None = None
+    status: int | None = None
+    error: str | None = None
+
+
+class HenCoopRequestTracer:
+    """
+    Record per-phase timings of the last `TRACE_SIZE` requests of a session.
+
+    Pass `trace_config` to the session the client uses. Requests are only
+    traced while `enabled` is set.
+    """
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        """Initialize."""
+        self.enabled = False
+        self.traces: deque[RequestTrace] = deque(maxlen=size)
+        self.trace_config = aiohttp.TraceConfig()
+        config = self.trace_config
+        config.on_request_start.append(self._on_request_start)
+        config.on_connection_queued_start.append(self._on_queued_start)
+        config.on_connection_queued_end.append(self._on_queued_end)
+        config.on_dns_resolvehost_start.append(self._on_dns_start)
+        config.on_dns_resolvehost_end.append(self._on_dns_end)
+        config.on_connection_create_start.append(self._on_connect_start)
+        config.on_connection_create_end.append(self._on_connect_end)
+        config.on_connection_reuseconn.append(self._on_reuseconn)
+        config.on_request_headers_sent.append(self._on_headers_sent)
+        config.on_request_end.append(self._on_request_end)
+        config.on_request_exception.append(self._on_request_exception)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the traces kept, oldest first."""
+        return [asdict(trace) for trace in self.traces]
+
+    async def _on_request_start(
+        self,
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        ctx.trace = (
+            RequestTrace(params.method.upper(), params.url.path_qs, time())
+            if self.enabled
+            else None
+        )
+        ctx.started = ctx.sent = monotonic()
+
+    async def _on_queued_start(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        ctx.queued = monotonic()
+
+    async def _on_queued_end(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        if ctx.trace is not None:
+            ctx.trace.queued = monotonic() - ctx.queued
+
+    async def _on_dns_start(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        ctx.dns = monotonic()
+
+    async def _on_dns_end(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        if ctx.trace is not None:
+            ctx.trace.dns = monotonic() - ctx.dns
+
+    async def _on_connect_start(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        ctx.connect = monotonic()
+
+    async def _on_connect_end(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        if ctx.trace is not None:
+            # Name resolution happens inside the connection setup
+            ctx.trace.connect = monotonic() - ctx.connect - (ctx.trace.dns or 0)
+
+    async def _on_reuseconn(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        if ctx.trace is not None:
+            ctx.trace.reused_connection = True
+
+    async def _on_headers_sent(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any
+    ) -> None:
+        ctx.sent = monotonic()
+        if ctx.trace is not None:
+            ctx.trace.sent = ctx.sent - ctx.started
+
+    async def _on_request_end(
+        self,
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        if (trace := ctx.trace) is None:
+            return
+        now = monotonic()
+        trace.wait = now - ctx.sent
+        trace.total = now - ctx.started
+        trace.status = params.response.status
+        self.traces.append(trace)
+
+    async def _on_request_exception(
+        self,
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        if (trace := ctx.trace) is None:
+            return
+        trace.total = monotonic() - ctx.started
+        trace.error = type(params.exception).__name__
+        self.traces.append(trace)
@@ -0,0 +1,69 @@
+"""Learned door travel time for hacs-hen-coop."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+from .const import DOOR_DURATION
+from .motion import DoorDirection
+
+# Travel times kept per direction
+TRAVEL_SAMPLES = 20
+# Samples needed before the learned duration replaces DOOR_DURATION
+TRAVEL_MIN_SAMPLES = 3
+# The duration sent covers this percentile of the observed travel times ...
+TRAVEL_PERCENTILE = 90
+# ... stretched by a relative and an absolute safety margin
+TRAVEL_MARGIN_FACTOR = 1.2
+TRAVEL_MARGIN_SECONDS = 3
+
+
+class DoorTravelModel:
+    """
+    Learn how long the door takes to travel in each direction.
+
+    Keeps a rolling window of confirmed end-to-end travel times per direction
+    and derives the motor run to send from a high percentile plus a margin.
+    """
+
+    def __init__(self, samples: dict[str, list[float]] | None = None) -> None:
+        """Initialize from previously stored samples."""
+        samples = samples or {}
+        self._samples = {
+            direction: deque(samples.get(direction, []), maxlen=TRAVEL_SAMPLES)
+            for direction in DoorDirection
+        }
+
+    def record(self, direction: DoorDirection, seconds: float | None) -> None:
+        """
+        Record the outcome of a door travel.
+
+        Args:
+            direction: Direction the door travelled in
+            seconds: Confirmed travel time, or None if the motor ran out before
+                the reed sensor confirmed the end position
+
+        """
+        if seconds is None:
+            # The learned run was too short, start over from the default
+            self._samples[direction].clear()
+        else:
+            self._samples[direction].append(round(seconds, 1))
+
+    def duration(self, direction: DoorDirection) -> int:
+        """Return the motor run in seconds to send for a travel."""
+        samples = sorted(self._samples[direction])
+        if len(samples) < TRAVEL_MIN_SAMPLES:
+            return DOOR_DURATION
+        # Nearest-rank percentile
+        rank = math.ceil(TRAVEL_PERCENTILE / 100 * len(samples)) - 1
+        learned = samples[rank] * TRAVEL_MARGIN_FACTOR + TRAVEL_MARGIN_SECONDS
+        return min(math.ceil(learned), DOOR_DURATION)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the samples for storage."""
+        return {
+            direction: list(samples) for direction, samples in self._samples.items()
+        }
@@ -0,0 +1,52 @@
+"""Tests for the HenCoop integration."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_API_TOKEN, CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+# The integration directory is not a valid module name
+DOMAIN = "hacs-hen-coop"
+# Seconds to wait for something driven by a real socket
+WAIT_TIMEOUT = 5
+
+
+def integration_module(name: str) -> Any:
+    """Import a module of the integration."""
+    return importlib.import_module(f"custom_components.{DOMAIN}.{name}")
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    url: str,
+    options: dict[str, Any] | None = None,
+    *,
+    token: str = "token",
+    loaded: bool = True,
+) -> MockConfigEntry:
+    """Add an entry for the controller at `url` and set it up."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: url, CONF_API_TOKEN: token},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id) is loaded
+    await hass.async_block_till_done()
+    return entry
+
+
+async def async_wait_for(condition: Callable[[], bool]) -> None:
+    """Wait until `condition` holds, for things driven by real sockets."""
+    async with asyncio.timeout(WAIT_TIMEOUT):
+        while not condition():  # noqa: ASYNC110
+            await asyncio.sleep(0.01)
@@ -0,0 +1,37 @@
+"""Fixtures for HenCoop tests."""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+import pytest
+
+from benchmarks.controller import FakeController
+
+from . import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+# Import the integration before the plugin's testing config, which ships a
+# custom_components package of its own, can shadow this checkout's
+importlib.import_module(f"custom_components.{DOMAIN}")
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from this checkout."""
+
+
+@pytest.fixture
+async def controller(
+    socket_enabled: None,  # noqa: ARG001
+) -> AsyncIterator[FakeController]:
+    """Serve a fake controller on a local port."""
+    controller = FakeController()
+    await controller.async_start()
+    yield controller
+    await controller.async_stop()
@@ -0,0 +1,247 @@
+"""Tests for the HenCoop API client against local stand-ins."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from . import integration_module
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from pytest_aiohttp import AiohttpServer
+
+    from benchmarks.controller import FakeController
+
+api = integration_module("api")
+models = integration_module("models")
+
+
+async def _async_events(
+    aiohttp_server: AiohttpServer,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> list[object]:
+    """Return every door status streamed by a server with the given handler."""
+    app = web.Application()
+    app.router.add_get("/door-status/events", handler)
+    server = await aiohttp_server(app)
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(str(server.make_url("/")), "token", session)
+        return [door async for door in client.async_door_status_events()]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_door_status_events(aiohttp_server: AiohttpServer) -> None:
+    """Events dispatch on a blank line, comments and other fields are skipped."""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        assert request.headers["Accept"] == "text/event-stream"
+        assert request.headers["Authorization"] == "Bearer token"
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b": heartbeat\n\n")
+        await response.write(b'event: door\r\ndata: {"top": true,\r\n')
+        await response.write(b'data: "bottom": false}\r\n\r\n')
+        await response.write(b'data:{"top": false, "bottom": true}\n\n')
+        # An event cut off by the connection closing is dropped
+        await response.write(b'data: {"top": true, "bottom": true}\n')
+        return response
+
+    assert await _async_events(aiohttp_server, handler) == [
+        models.DoorStatus(top=True, bottom=False),
+        models.DoorStatus(top=False, bottom=True),
+    ]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_door_status_events_invalid(aiohttp_server: AiohttpServer) -> None:
+    """A malformed event ends the stream with an API error."""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b'data: {"top": true}\n\n')
+        return response
+
+    with pytest.raises(api.HenCoopApiClientError, match="Invalid door status"):
+        await _async_events(aiohttp_server, handler)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_door_status_events_unauthorized(aiohttp_server: AiohttpServer) -> None:
+    """A rejected token is reported as such, not as a dropped stream."""
+
+    async def handler(_: web.Request) -> web.StreamResponse:
+        raise web.HTTPUnauthorized
+
+    with pytest.raises(api.HenCoopApiClientAuthenticationError):
+        await _async_events(aiohttp_server, handler)
+
+
+async def test_conditional_get(controller: FakeController) -> None:
+    """A 304 returns the model decoded from the tagged response, unchanged."""
+    controller.etag = True
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        first = await client.async_door_status()
+        client._invalidate_cache()
+        assert await client.async_door_status() is first
+        assert controller.not_modified == 1
+
+        controller.move(top=True, bottom=False)
+        client._invalidate_cache()
+        assert await client.async_door_status() == models.DoorStatus(
+            top=True, bottom=False
+        )
+        assert controller.not_modified == 1
+
+
+async def test_get_without_etag(controller: FakeController) -> None:
+    """Reads stay unconditional while the controller sends no ETag."""
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        first = await client.async_door_status()
+        client._invalidate_cache()
+        second = await client.async_door_status()
+    assert second == first
+    assert second is not first
+    assert controller.not_modified == 0
+
+
+async def test_circuit_breaker(
+    controller: FakeController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Reads fail fast after repeated failures, until the breaker lets one probe."""
+    monkeypatch.setattr(api, "RETRY_BACKOFF", 0)
+    controller.failure_rate = 1
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        for _ in range(api.CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(api.HenCoopApiClientCommunicationError):
+                await client.async_door_status()
+        assert controller.requests == api.CIRCUIT_FAILURE_THRESHOLD * api.GET_ATTEMPTS
+
+        with pytest.raises(api.HenCoopApiClientCommunicationError, match="not trying"):
+            await client.async_door_status()
+        assert controller.requests == api.CIRCUIT_FAILURE_THRESHOLD * api.GET_ATTEMPTS
+
+        # A stop still reaches the controller
+        with pytest.raises(api.HenCoopApiClientError):
+            await client.async_stop()
+        assert controller.paths["/stop"] == 1
+
+        controller.failure_rate = 0
+        monkeypatch.setattr(api, "CIRCUIT_OPEN_SECONDS", 0)
+        assert await client.async_door_status() == models.DoorStatus(
+            top=False, bottom=True
+        )
+
+
+async def test_commands_do_not_open_circuit(
+    controller: FakeController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Failed commands are not counted towards opening the breaker."""
+    monkeypatch.setattr(api, "RETRY_BACKOFF", 0)
+    controller.failure_rate = 1
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        for _ in range(api.CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(api.HenCoopApiClientError):
+                await client.async_stop()
+
+        controller.failure_rate = 0
+        assert await client.async_door_status() == models.DoorStatus(
+            top=False, bottom=True
+        )
+
+
+async def test_read_slot_per_attempt(
+    controller: FakeController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The read slot is held for each attempt and released before backing off."""
+    monkeypatch.setattr(api, "RETRY_BACKOFF", 0)
+    controller.failure_rate = 1
+    held: list[bool] = []
+
+    @asynccontextmanager
+    async def read_slot() -> AsyncIterator[None]:
+        held.append(True)
+        try:
+            yield
+        finally:
+            held.append(False)
+
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        client.read_slot = read_slot
+        with pytest.raises(api.HenCoopApiClientCommunicationError):
+            await client.async_door_status()
+        assert held == [True, False] * api.GET_ATTEMPTS
+
+        # Commands never wait for a slot
+        held.clear()
+        controller.failure_rate = 0
+        await client.async_stop()
+        assert held == []
+
+
+async def test_concurrent_reads_merge(controller: FakeController) -> None:
+    """Reads arriving while one is in flight share its response."""
+    controller.latency = 0.1
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        first, second = await asyncio.gather(
+            client.async_door_status(), client.async_door_status()
+        )
+    assert first is second
+    assert controller.paths["/door-status"] == 1
+
+
+async def test_cached_read_expires(
+    controller: FakeController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A completed read is reused until it is older than the cache TTL."""
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        first = await client.async_door_status()
+        assert await client.async_door_status() is first
+        assert controller.paths["/door-status"] == 1
+
+        monkeypatch.setattr(api, "GET_CACHE_TTL", 0)
+        await client.async_door_status()
+    assert controller.paths["/door-status"] == 2
+
+
+async def test_command_invalidates_read(controller: FakeController) -> None:
+    """A read in flight while a command is sent is not cached for later reads."""
+    controller.latency = 0.1
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(controller.url, "token", session)
+        reading = asyncio.ensure_future(client.async_door_status())
+        await asyncio.sleep(0.05)
+        await client.async_stop()
+        await reading
+        await client.async_door_status()
+    assert controller.paths["/door-status"] == 2
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_malformed_response(aiohttp_server: AiohttpServer) -> None:
+    """A payload that does not decode is reported as an API error."""
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.json_response({"top": True})
+
+    app = web.Application()
+    app.router.add_get("/door-status", handler)
+    server = await aiohttp_server(app)
+    async with aiohttp.ClientSession() as session:
+        client = api.HenCoopApiClient(str(server.make_url("/")), "token", session)
+        with pytest.raises(api.HenCoopApiClientError, match="Invalid response"):
+            await client.async_door_status()
@@ -0,0 +1,35 @@
+"""Tests for the HenCoop binary sensors."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_OFF, STATE_ON
+
+from . import async_setup_entry, integration_module
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from benchmarks.controller import FakeController
+
+models = integration_module("models")
+
+
+async def test_gpio_pins(hass: HomeAssistant, controller: FakeController) -> None:
+    """Each pin's entity shows its bit of the polled bank."""
+    controller.pins = {4: 1, 17: 0, 22: 1}
+    entry = await async_setup_entry(hass, controller.url, {"gpio_pins": ["4", "17"]})
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.data.gpio == models.GpioBank(1 << 4)
+    assert hass.states.get("binary_sensor.hen_coop_gpio_4").state == STATE_ON
+    assert hass.states.get("binary_sensor.hen_coop_gpio_17").state == STATE_OFF
+
+    controller.pins = {4: 0, 17: 1}
+    coordinator.client._invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.hen_coop_gpio_4").state == STATE_OFF
+    assert hass.states.get("binary_sensor.hen_coop_gpio_17").state == STATE_ON
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
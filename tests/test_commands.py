@@ -0,0 +1,233 @@
+"""Tests for the door command queue."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from . import integration_module
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+commands = integration_module("commands")
+DoorCommand = commands.DoorCommand
+
+
+class _Controller:
+    """Record sent commands, each one held until released."""
+
+    def __init__(self) -> None:
+        self.sent: list[DoorCommand] = []
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+        # Acceptance returned for a command sent, done at once if missing
+        self.accepted: dict[DoorCommand, asyncio.Future[None]] = {}
+
+    async def send(self, command: DoorCommand) -> asyncio.Future[None] | None:
+        self.sent.append(command)
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.accepted.get(command)
+
+
+@pytest.fixture
+def controller() -> _Controller:
+    """Return a controller holding every command until released."""
+    return _Controller()
+
+
+@pytest.fixture
+def queue(hass: HomeAssistant, controller: _Controller) -> object:
+    """Return a queue sending to the controller."""
+    return commands.HenCoopCommandQueue(hass, controller.send, lambda: None)
+
+
+async def test_one_at_a_time(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A command is only sent once the one before it is done."""
+    stopping = hass.async_create_task(queue.async_submit(DoorCommand.STOP))
+    opening = hass.async_create_task(queue.async_submit(DoorCommand.OPEN))
+    await asyncio.sleep(0)
+    assert controller.sent == [DoorCommand.STOP]
+    assert queue.depth == 2
+
+    controller.release.set()
+    await asyncio.gather(stopping, opening)
+    assert controller.sent == [DoorCommand.STOP, DoorCommand.OPEN]
+    assert queue.depth == 0
+
+
+async def test_merge(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """Repeats of a queued command or one just sent are merged into it."""
+    submitted = [
+        hass.async_create_task(queue.async_submit(command))
+        for command in (DoorCommand.STOP, DoorCommand.OPEN, DoorCommand.OPEN)
+    ]
+    await asyncio.sleep(0)
+    assert queue.depth == 2
+    controller.release.set()
+    await asyncio.gather(*submitted)
+
+    # Within the debounce window of the open just sent
+    await queue.async_submit(DoorCommand.OPEN)
+    assert controller.sent == [DoorCommand.STOP, DoorCommand.OPEN]
+
+
+async def test_supersede(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A newer command drops queued ones moving the door the other way."""
+    submitted = [
+        hass.async_create_task(queue.async_submit(command))
+        for command in (DoorCommand.STOP, DoorCommand.OPEN, DoorCommand.CLOSE)
+    ]
+    await asyncio.sleep(0)
+    # The dropped open is done at once
+    await submitted[1]
+    assert queue.depth == 2
+
+    controller.release.set()
+    await asyncio.gather(*submitted)
+    assert controller.sent == [DoorCommand.STOP, DoorCommand.CLOSE]
+
+
+async def test_no_supersede(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A command that does not supersede leaves queued ones alone."""
+    submitted = [
+        hass.async_create_task(queue.async_submit(DoorCommand.STOP)),
+        hass.async_create_task(queue.async_submit(DoorCommand.OPEN)),
+        hass.async_create_task(queue.async_submit(DoorCommand.CLOSE, supersede=False)),
+    ]
+    await asyncio.sleep(0)
+    controller.release.set()
+    await asyncio.gather(*submitted)
+    assert controller.sent == [DoorCommand.STOP, DoorCommand.OPEN, DoorCommand.CLOSE]
+
+
+async def test_supersede_sending(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A stop cancels an open still being sent, which is done at once."""
+    opening = hass.async_create_task(queue.async_submit(DoorCommand.OPEN))
+    stopping = hass.async_create_task(queue.async_submit(DoorCommand.STOP))
+    await opening
+    controller.release.set()
+    await stopping
+    assert controller.sent == [DoorCommand.OPEN, DoorCommand.STOP]
+
+    # Nothing to merge into, the open is sent again
+    await queue.async_submit(DoorCommand.OPEN)
+    assert controller.sent == [DoorCommand.OPEN, DoorCommand.STOP, DoorCommand.OPEN]
+
+
+async def test_error(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A failed command fails its submitter and the queue moves on."""
+    controller.error = ValueError("refused")
+    stopping = hass.async_create_task(queue.async_submit(DoorCommand.STOP))
+    closing = hass.async_create_task(queue.async_submit(DoorCommand.CLOSE))
+    await asyncio.sleep(0)
+    controller.release.set()
+    with pytest.raises(ValueError, match="refused"):
+        await stopping
+    with pytest.raises(ValueError, match="refused"):
+        await closing
+    assert controller.sent == [DoorCommand.STOP, DoorCommand.CLOSE]
+
+
+async def test_cancel(hass: HomeAssistant, queue: object) -> None:
+    """Cancelling the queue releases everyone waiting on it."""
+    submitted = [
+        hass.async_create_task(queue.async_submit(command))
+        for command in (DoorCommand.STOP, DoorCommand.OPEN)
+    ]
+    await asyncio.sleep(0)
+    queue.async_cancel()
+    for task in submitted:
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert queue.depth == 0
+
+
+async def test_accept_outside_queue(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A command waits for its acceptance without holding up the next one."""
+    controller.release.set()
+    controller.accepted[DoorCommand.OPEN] = hass.loop.create_future()
+    opening = hass.async_create_task(queue.async_submit(DoorCommand.OPEN))
+    await queue.async_submit(DoorCommand.STOP)
+    assert controller.sent == [DoorCommand.OPEN, DoorCommand.STOP]
+    assert not opening.done()
+
+    controller.accepted[DoorCommand.OPEN].set_result(None)
+    await opening
+
+
+async def test_send(controller: _Controller, queue: object) -> None:
+    """Sending returns once the command is out, with its acceptance."""
+    controller.release.set()
+    accepted = controller.accepted[DoorCommand.CLOSE] = asyncio.Future()
+    assert await queue.async_send(DoorCommand.CLOSE) is accepted
+    assert await queue.async_send(DoorCommand.STOP) is None
+    assert queue.depth == 0
+
+
+async def test_send_without_suspending(hass: HomeAssistant) -> None:
+    """The queue keeps working when a send completes without suspending."""
+    sent: list[DoorCommand] = []
+
+    async def send(command: DoorCommand) -> None:
+        sent.append(command)
+
+    queue = commands.HenCoopCommandQueue(hass, send, lambda: None)
+    await queue.async_submit(DoorCommand.OPEN)
+    await queue.async_submit(DoorCommand.STOP)
+    assert sent == [DoorCommand.OPEN, DoorCommand.STOP]
+
+
+async def test_no_merge_after_failure(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """A repeat of a command that failed or was refused is sent again."""
+    controller.release.set()
+    controller.error = ValueError("refused")
+    with pytest.raises(ValueError, match="refused"):
+        await queue.async_submit(DoorCommand.OPEN)
+    controller.error = None
+    await queue.async_submit(DoorCommand.OPEN)
+    assert controller.sent == [DoorCommand.OPEN, DoorCommand.OPEN]
+
+    refused = controller.accepted[DoorCommand.CLOSE] = hass.loop.create_future()
+    refused.set_exception(ValueError("refused"))
+    with pytest.raises(ValueError, match="refused"):
+        await queue.async_submit(DoorCommand.CLOSE)
+    del controller.accepted[DoorCommand.CLOSE]
+    await queue.async_submit(DoorCommand.CLOSE)
+    assert controller.sent[2:] == [DoorCommand.CLOSE, DoorCommand.CLOSE]
+
+
+async def test_cancel_sending(
+    hass: HomeAssistant, controller: _Controller, queue: object
+) -> None:
+    """Cancelling the queue also cancels the command being sent."""
+    opening = hass.async_create_task(queue.async_submit(DoorCommand.OPEN))
+    await asyncio.sleep(0)
+    assert controller.sent == [DoorCommand.OPEN]
+    sending = queue._sending[1]
+
+    queue.async_cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await opening
+    await asyncio.sleep(0)
+    assert sending.cancelled()
@@ -0,0 +1,63 @@
+"""Tests for controllers shared by config entries."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, EVENT_HOMEASSISTANT_STOP
+
+from . import async_setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from benchmarks.controller import FakeController
+
+
+async def test_shared(hass: HomeAssistant, controller: FakeController) -> None:
+    """Entries for the same controller share its coordinator and session."""
+    first = await async_setup_entry(hass, controller.url)
+    second = await async_setup_entry(hass, f"{controller.url}/")
+    coordinator = first.runtime_data.coordinator
+    assert second.runtime_data.coordinator is coordinator
+    session = coordinator.client.session
+    connector = session.connector
+    assert second.runtime_data.coordinator.client.session.connector is connector
+
+    # Only the last entry releasing the controller closes the session
+    assert await hass.config_entries.async_unload(first.entry_id)
+    assert not session.closed
+    assert not connector.closed
+    assert await hass.config_entries.async_unload(second.entry_id)
+    assert session.closed
+    assert connector.closed
+
+
+async def test_other_token(hass: HomeAssistant, controller: FakeController) -> None:
+    """An entry for a controller in use with another token is refused."""
+    first = await async_setup_entry(hass, controller.url)
+    second = await async_setup_entry(hass, controller.url, token="other", loaded=False)
+    assert second.state is ConfigEntryState.SETUP_ERROR
+    assert first.state is ConfigEntryState.LOADED
+
+    assert await hass.config_entries.async_unload(first.entry_id)
+
+
+async def test_home_assistant_stop(
+    hass: HomeAssistant, controller: FakeController
+) -> None:
+    """A controller shuts down with Home Assistant and closes its session last."""
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert coordinator._stream is None
+    assert not coordinator.client.session.closed
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert coordinator.client.session.closed
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
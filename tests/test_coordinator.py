@@ -0,0 +1,276 @@
+"""Tests for the HenCoop coordinator against a fake controller."""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_CLOSED, STATE_OPEN
+
+from . import async_setup_entry, async_wait_for, integration_module
+
+if TYPE_CHECKING:
+    import pytest
+    from homeassistant.core import HomeAssistant
+
+    from benchmarks.controller import FakeController
+
+const = integration_module("const")
+fleet = integration_module("fleet")
+models = integration_module("models")
+ratelimit = integration_module("ratelimit")
+DoorDirection = integration_module("motion").DoorDirection
+
+COVER = "cover.hen_coop_door"
+
+
+async def test_stream_pauses_polling(
+    hass: HomeAssistant, controller: FakeController
+) -> None:
+    """Pushed door states reach the entities without any poll."""
+    controller.stream = True
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    await async_wait_for(lambda: coordinator.streaming)
+    assert coordinator.update_interval is None
+    assert hass.states.get(COVER).state == STATE_CLOSED
+    polls = controller.paths["/door-status"]
+
+    controller.move(top=True, bottom=False)
+    await async_wait_for(lambda: hass.states.get(COVER).state == STATE_OPEN)
+    assert controller.paths["/door-status"] == polls
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_stream_reconnects(
+    hass: HomeAssistant,
+    controller: FakeController,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Polling covers a lost stream until it is connected again."""
+    monkeypatch.setattr(
+        integration_module("coordinator"),
+        "STREAM_RECONNECT_MIN",
+        timedelta(milliseconds=50),
+    )
+    controller.stream = True
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    await async_wait_for(lambda: coordinator.streaming)
+    polls = controller.paths["/door-status"]
+
+    controller.stream = False
+    controller.drop_streams()
+    await async_wait_for(lambda: not coordinator.streaming)
+    # Catches up on what was missed right away
+    await async_wait_for(lambda: controller.paths["/door-status"] > polls)
+    assert coordinator.update_interval is not None
+    # Keeps trying to reconnect in the background
+    attempts = controller.paths["/door-status/events"]
+    await async_wait_for(lambda: controller.paths["/door-status/events"] > attempts)
+
+    controller.move(top=True, bottom=False)
+    controller.stream = True
+    await async_wait_for(lambda: coordinator.streaming)
+    assert coordinator.update_interval is None
+    await async_wait_for(lambda: hass.states.get(COVER).state == STATE_OPEN)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_stream_unavailable(
+    hass: HomeAssistant, controller: FakeController
+) -> None:
+    """Without a stream the controller is polled."""
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    await async_wait_for(lambda: controller.paths["/door-status/events"] > 0)
+    assert not coordinator.streaming
+    assert coordinator.update_interval == const.IDLE_UPDATE_INTERVAL
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_unchanged_poll(hass: HomeAssistant, controller: FakeController) -> None:
+    """A poll answered with 304 keeps the status and writes no state."""
+    controller.etag = True
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    status = coordinator.data
+    reported = hass.states.get(COVER).last_reported
+
+    coordinator.client._invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert controller.not_modified == 1
+    assert coordinator.data is status
+    assert hass.states.get(COVER).last_reported == reported
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_repeated_status(hass: HomeAssistant, controller: FakeController) -> None:
+    """A door status read again during a travel is not published again."""
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    status = coordinator.data
+    reported = hass.states.get(COVER).last_reported
+
+    coordinator._async_set_door_status(models.DoorStatus(top=False, bottom=True))
+    await hass.async_block_till_done()
+    assert coordinator.data is status
+    assert hass.states.get(COVER).last_reported == reported
+
+    # Read again, a restored status is confirmed
+    coordinator.data = dataclasses.replace(status, restored=True)
+    coordinator._async_set_door_status(models.DoorStatus(top=False, bottom=True))
+    assert not coordinator.data.restored
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_stalled_close(hass: HomeAssistant, controller: FakeController) -> None:
+    """A close that times out is stopped, counted and forgets the learned run."""
+    controller.move(top=True, bottom=False)
+    controller.travel = 60
+    entry = await async_setup_entry(hass, controller.url, {"travel_timeout": 0.3})
+    coordinator = entry.runtime_data.coordinator
+    coordinator.travel.record(DoorDirection.CLOSING, 10)
+
+    await hass.services.async_call(
+        "cover", "close_cover", {"entity_id": COVER}, blocking=True
+    )
+    await async_wait_for(lambda: controller.paths["/stop"] == 1)
+    assert not coordinator.motion.is_moving
+    assert coordinator.history.failed_closes_today(time.time()) == 1
+    assert coordinator.travel.as_dict()[DoorDirection.CLOSING] == []
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_stop_cancels_held_open(
+    hass: HomeAssistant, controller: FakeController
+) -> None:
+    """An open held back by the rate limiter is cancelled by a stop, not sent late."""
+    entry = await async_setup_entry(hass, controller.url, {"command_rate_limit": 0.01})
+    coordinator = entry.runtime_data.coordinator
+    for _ in range(ratelimit.COMMAND_BURST):
+        await coordinator.client.limiter.async_acquire(ratelimit.RequestBudget.COMMAND)
+
+    opening = hass.async_create_task(
+        hass.services.async_call(
+            "cover", "open_cover", {"entity_id": COVER}, blocking=True
+        )
+    )
+    await async_wait_for(lambda: coordinator.commands.depth == 1)
+    assert not coordinator.motion.is_moving
+    await hass.services.async_call(
+        "cover", "stop_cover", {"entity_id": COVER}, blocking=True
+    )
+    await opening
+    assert controller.paths["/open-door"] == 0
+    assert controller.paths["/stop"] == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_command_polls_fast(
+    hass: HomeAssistant,
+    controller: FakeController,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An open polls fast while it is accepted and travels, then idles again."""
+    monkeypatch.setattr(
+        integration_module("coordinator"), "FAST_POLL_WINDOW", timedelta(0)
+    )
+    controller.travel = 1.5
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.update_interval == const.IDLE_UPDATE_INTERVAL
+    polls = controller.paths["/door-status"]
+
+    await hass.services.async_call(
+        "cover", "open_cover", {"entity_id": COVER}, blocking=True
+    )
+    assert coordinator.update_interval == const.FAST_UPDATE_INTERVAL
+    await async_wait_for(lambda: hass.states.get(COVER).state == STATE_OPEN)
+    assert controller.paths["/door-status"] > polls
+    await async_wait_for(
+        lambda: coordinator.update_interval == const.IDLE_UPDATE_INTERVAL
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_fleet_jitter_keeps_cadence(
+    hass: HomeAssistant,
+    controller: FakeController,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Idle polls of a fleet are jittered without changing the cadence shown."""
+    spread: list[timedelta] = []
+
+    def _spread(_: object, __: str, interval: timedelta) -> timedelta:
+        spread.append(interval)
+        return interval * (0.9 if len(spread) % 2 else 1.1)
+
+    monkeypatch.setattr(fleet.HenCoopFleetScheduler, "spread", _spread)
+    entry = await async_setup_entry(hass, controller.url, {"fleet_scheduling": True})
+    coordinator = entry.runtime_data.coordinator
+    listened: list[None] = []
+    coordinator.async_add_listener(lambda: listened.append(None))
+
+    for _ in range(3):
+        await coordinator.async_refresh()
+    assert spread
+    assert coordinator.update_interval == const.IDLE_UPDATE_INTERVAL
+    assert listened == []
+    assert coordinator.poll_lag is not None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_adaptive_cadence(
+    hass: HomeAssistant,
+    controller: FakeController,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Polls speed up while the door is between its ends, for a while at most."""
+    coordinator_module = integration_module("coordinator")
+    monkeypatch.setattr(coordinator_module, "FAST_POLL_WINDOW", timedelta(0))
+    entry = await async_setup_entry(hass, controller.url)
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.update_interval == const.IDLE_UPDATE_INTERVAL
+
+    async def _async_poll() -> timedelta | None:
+        coordinator.client._invalidate_cache()
+        await coordinator.async_refresh()
+        return coordinator.update_interval
+
+    # Moved by hand, the door travels between its ends
+    controller.move(top=False, bottom=False)
+    assert await _async_poll() == const.FAST_UPDATE_INTERVAL
+    controller.move(top=True, bottom=False)
+    assert await _async_poll() == const.IDLE_UPDATE_INTERVAL
+
+    # Stuck between its ends, fast polling gives up after the transit timeout
+    monkeypatch.setattr(coordinator_module, "FAST_POLL_TRANSIT_TIMEOUT", timedelta(0))
+    controller.move(top=False, bottom=False)
+    assert await _async_poll() == const.IDLE_UPDATE_INTERVAL
+    controller.move(top=False, bottom=True)
+    assert await _async_poll() == const.IDLE_UPDATE_INTERVAL
+
+    # A command keeps polling fast alongside its travel watch
+    controller.travel = 1
+    await hass.services.async_call(
+        "cover", "open_cover", {"entity_id": COVER}, blocking=True
+    )
+    await async_wait_for(lambda: coordinator._travel_watch is not None)
+    assert await _async_poll() == const.FAST_UPDATE_INTERVAL
+    await async_wait_for(lambda: coordinator._travel_watch is None)
+    assert await _async_poll() == const.IDLE_UPDATE_INTERVAL
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
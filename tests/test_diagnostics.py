@@ -0,0 +1,54 @@
+"""Tests for the HenCoop diagnostics."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from yarl import URL
+
+from . import async_setup_entry, integration_module
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from benchmarks.controller import FakeController
+
+diagnostics = integration_module("diagnostics")
+
+
+async def test_redacted(hass: HomeAssistant, controller: FakeController) -> None:
+    """Neither the host nor the API token of the controller are included."""
+    entry = await async_setup_entry(hass, controller.url, token="secret-token")
+    coordinator = entry.runtime_data.coordinator
+    controller.failure_rate = 1
+    coordinator.client._invalidate_cache()
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert URL(controller.url).host in str(coordinator.last_exception)
+
+    dump = json.dumps(
+        await diagnostics.async_get_config_entry_diagnostics(hass, entry),
+        default=str,
+    )
+    assert "secret-token" not in dump
+    assert URL(controller.url).host not in dump
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_traces(hass: HomeAssistant, controller: FakeController) -> None:
+    """Traced requests are included while request tracing is enabled."""
+    entry = await async_setup_entry(hass, controller.url, {"request_tracing": True})
+    coordinator = entry.runtime_data.coordinator
+    coordinator.client._invalidate_cache()
+    await coordinator.async_refresh()
+
+    result = await diagnostics.async_get_config_entry_diagnostics(hass, entry)
+    trace = next(trace for trace in result["traces"] if trace["url"] == "/door-status")
+    assert trace["method"] == "GET"
+    assert trace["status"] == 200
+    assert trace["total"] is not None
+    assert result["metrics"]["/door-status"]["requests"] >= 2
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,108 @@
+"""Tests for the door event history."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from . import integration_module
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+history = integration_module("history")
+models = integration_module("models")
+DoorEvent = history.DoorEvent
+
+OPEN = models.DoorStatus(top=True, bottom=False)
+CLOSED = models.DoorStatus(top=False, bottom=True)
+BETWEEN = models.DoorStatus(top=False, bottom=False)
+# Noon of a day, timestamps in the tests are seconds after it
+NOON = datetime(2026, 3, 1, 12, tzinfo=dt_util.UTC).timestamp()
+
+
+def _cycle(door: object, start: float) -> None:
+    """Open the door at `start` and close it an hour later."""
+    for offset, status in (
+        (0, BETWEEN),
+        (20, OPEN),
+        (3600, BETWEEN),
+        (3625, CLOSED),
+    ):
+        door.observe(status, start + offset)
+
+
+def test_statistics() -> None:
+    """Transitions update the daily statistics as they are recorded."""
+    door = history.DoorHistory()
+    door.observe(CLOSED, NOON)
+    assert len(door) == 0
+
+    _cycle(door, NOON)
+    door.record(DoorEvent.CLOSE_FAILED, NOON + 4000)
+    assert len(door) == 5
+    assert door.cycles_today(NOON + 5000) == 1
+    assert door.failed_closes_today(NOON + 5000) == 1
+    assert door.last_travel_time == 25
+    assert door.time_open_today(NOON + 5000) == 3625
+
+
+def test_replay() -> None:
+    """Stored events rebuild the same statistics."""
+    door = history.DoorHistory()
+    door.observe(CLOSED, NOON)
+    _cycle(door, NOON)
+    restored = history.DoorHistory(door.as_dict())
+    assert list(restored) == list(door)
+    assert restored.cycles_today(NOON + 5000) == 1
+    assert restored.last_travel_time == 25
+    assert restored.time_open_today(NOON + 5000) == 3625
+    # Transitions continue from the stored door status
+    restored.observe(CLOSED, NOON + 6000)
+    assert len(restored) == len(door)
+
+
+def test_ring_buffer() -> None:
+    """The oldest events are overwritten once the history is full."""
+    door = history.DoorHistory(size=3)
+    for offset in range(5):
+        door.record(DoorEvent.STOP_SENT, NOON + offset)
+    assert [when - NOON for when, _ in door] == [2, 3, 4]
+
+
+def test_new_day() -> None:
+    """Daily statistics start over at local midnight."""
+    door = history.DoorHistory()
+    door.observe(CLOSED, NOON)
+    _cycle(door, NOON)
+    assert door.cycles_today(NOON + 86400) == 0
+    _cycle(door, NOON + 86400)
+    assert door.cycles_today(NOON + 86400 + 5000) == 1
+
+
+@pytest.fixture
+def los_angeles() -> Iterator[None]:
+    """Count the days in a time zone behind UTC."""
+    default = dt_util.get_default_time_zone()
+    dt_util.set_default_time_zone(dt_util.get_time_zone("America/Los_Angeles"))
+    yield
+    dt_util.set_default_time_zone(default)
+
+
+@pytest.mark.usefixtures("los_angeles")
+def test_new_local_day() -> None:
+    """Daily statistics follow the local day, not the UTC one."""
+    # 20:00 local is already the next day in UTC
+    evening = datetime(2026, 10, 17, 20, tzinfo=dt_util.get_default_time_zone())
+    start = evening.timestamp()
+    door = history.DoorHistory()
+    door.observe(CLOSED, start)
+    _cycle(door, start)
+    door.observe(BETWEEN, start + 7200)
+    assert door.cycles_today(start + 3 * 3600) == 1
+    # Half past midnight local, the door has been open for half an hour today
+    assert door.cycles_today(start + 4.5 * 3600) == 0
+    assert door.time_open_today(start + 4.5 * 3600) == 1800
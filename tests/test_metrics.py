@@ -0,0 +1,42 @@
+"""Tests for the request metrics."""
+
+from __future__ import annotations
+
+from . import integration_module
+
+metrics = integration_module("metrics")
+
+
+def test_percentiles() -> None:
+    """Percentiles report the upper bound of the bucket they fall in."""
+    endpoint = metrics.EndpointMetrics()
+    assert endpoint.percentile(50) is None
+    for latency, count in ((0.02, 90), (0.3, 6), (3, 3), (12, 1)):
+        for _ in range(count):
+            endpoint.observe(latency)
+    summary = endpoint.as_dict()
+    assert summary["requests"] == 100
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (0.025, 0.5, 5)
+    # Never above the slowest request seen
+    assert endpoint.percentile(100) == 12
+
+    endpoint.observe(200)
+    assert endpoint.percentile(100) == 200
+
+
+def test_errors() -> None:
+    """Failed requests are counted by error class and across endpoints."""
+    controller = metrics.HenCoopMetrics()
+    status = controller.endpoint("/door-status")
+    status.observe(0.01)
+    status.observe(10, TimeoutError())
+    status.observe(0.01, ConnectionResetError())
+    controller.endpoint("/stop").observe(0.01, ConnectionResetError())
+    controller.wait("read").observe(1)
+
+    assert status.as_dict()["errors"] == {
+        "TimeoutError": 1,
+        "ConnectionResetError": 1,
+    }
+    assert controller.endpoint("/door-status") is status
+    assert controller.errors == 3
@@ -0,0 +1,72 @@
+"""Tests for the models decoded from controller payloads."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from . import integration_module
+
+models = integration_module("models")
+
+
+def test_door_status() -> None:
+    """Reed sensor payloads decode to booleans."""
+    door = models.DoorStatus.from_json({"top": 1, "bottom": 0, "extra": "ignored"})
+    assert door == models.DoorStatus(top=True, bottom=False)
+    assert door.is_open
+    assert not door.is_closed
+
+
+def test_gpio() -> None:
+    """Pin payloads decode to a reading and a bitmask of high pins."""
+    assert models.GpioReading.from_json({"pin": "4", "value": 1}) == (
+        models.GpioReading(pin=4, value=1)
+    )
+    bank = models.GpioBank.from_json({"pins": {"4": 1, "17": 0, "22": 1}})
+    assert bank.mask == 1 << 4 | 1 << 22
+    assert bank.is_high(4)
+    assert not bank.is_high(17)
+
+
+@pytest.mark.parametrize(
+    ("model", "payload"),
+    [
+        (models.DoorStatus, {"top": True}),
+        (models.DoorStatus, []),
+        (models.GpioReading, {"pin": "four", "value": 1}),
+        (models.GpioReading, {"pin": 4, "value": None}),
+        (models.GpioBank, {"pins": {"four": 1}}),
+        (models.GpioBank, {"pins": [4]}),
+        (models.GpioBank, None),
+    ],
+)
+def test_malformed(model: Any, payload: Any) -> None:
+    """Malformed payloads raise one of the errors the client reports."""
+    with pytest.raises((AttributeError, KeyError, TypeError, ValueError)):
+        model.from_json(payload)
+
+
+def test_coop_status_storage() -> None:
+    """A stored status is restored as it was, marked as restored."""
+    status = models.CoopStatus(
+        models.DoorStatus(top=False, bottom=True), models.GpioBank(1 << 4)
+    )
+    restored = models.CoopStatus.from_dict(status.as_dict(), restored=True)
+    assert restored.restored
+    assert restored.door == status.door
+    assert restored.gpio == status.gpio
+
+
+def test_changes() -> None:
+    """Changed reed sensors and pins are named, incomparable statuses are not."""
+    closed = models.CoopStatus(
+        models.DoorStatus(top=False, bottom=True), models.GpioBank(1 << 4)
+    )
+    between = models.CoopStatus(
+        models.DoorStatus(top=False, bottom=False), models.GpioBank(1 << 17)
+    )
+    assert between.changes(closed) == {"bottom", "gpio_4", "gpio_17"}
+    assert closed.changes(closed) == set()
+    assert models.CoopStatus(closed.door).changes(closed) is None
@@ -0,0 +1,111 @@
+"""Tests for the door motion tracker."""
+
+from __future__ import annotations
+
+import pytest
+
+from . import integration_module
+
+motion = integration_module("motion")
+models = integration_module("models")
+DoorDirection = motion.DoorDirection
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Return a settable monotonic clock used by the tracker."""
+    now = [1000.0]
+    monkeypatch.setattr(motion, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def travels() -> list[tuple[DoorDirection, float | None]]:
+    """Return the travels reported by the tracker."""
+    return []
+
+
+@pytest.fixture
+def tracker(travels: list[tuple[DoorDirection, float | None]]) -> object:
+    """Return a tracker of a closed door reporting to `travels`."""
+    tracker = motion.DoorMotionTracker(on_travel=lambda *travel: travels.append(travel))
+    tracker.observe(models.DoorStatus(top=False, bottom=True))
+    return tracker
+
+
+def test_estimate(clock: list[float], tracker: object) -> None:
+    """The position follows the elapsed share of the travel time."""
+    assert tracker.position == 0
+    tracker.start(DoorDirection.OPENING, 20, 75)
+    assert tracker.is_moving
+    clock[0] += 5
+    assert tracker.position == 25
+    clock[0] += 30
+    # Only a sensor confirms an end position
+    assert tracker.position == 99
+
+
+def test_confirm(
+    clock: list[float],
+    tracker: object,
+    travels: list[tuple[DoorDirection, float | None]],
+) -> None:
+    """A reed sensor ends the motion and reports the travel time."""
+    tracker.start(DoorDirection.OPENING, 20, 75)
+    clock[0] += 12
+    assert tracker.observe(models.DoorStatus(top=True, bottom=False))
+    assert not tracker.is_moving
+    assert tracker.position == 100
+    assert travels == [(DoorDirection.OPENING, 12)]
+    # Confirming it again changes nothing
+    assert not tracker.observe(models.DoorStatus(top=True, bottom=False))
+
+
+def test_reading_is_pure(
+    clock: list[float],
+    tracker: object,
+    travels: list[tuple[DoorDirection, float | None]],
+) -> None:
+    """Reading the state of a motion run out changes nothing, a tick ends it."""
+    tracker.start(DoorDirection.CLOSING, 20, 75)
+    clock[0] += 20 + motion.MOTION_GRACE - 1
+    assert not tracker.tick()
+
+    clock[0] += 1
+    assert tracker.is_moving
+    assert tracker.position == 1
+    assert travels == []
+
+    assert tracker.tick()
+    assert not tracker.is_moving
+    assert tracker.position == 1
+    assert travels == [(DoorDirection.CLOSING, None)]
+    assert not tracker.tick()
+
+
+def test_stall(
+    clock: list[float],
+    tracker: object,
+    travels: list[tuple[DoorDirection, float | None]],
+) -> None:
+    """A stalled travel is reported as failed, a later stop changes nothing."""
+    tracker.start(DoorDirection.OPENING, 20, 75)
+    clock[0] += 10
+    tracker.stall()
+    tracker.stop()
+    assert not tracker.is_moving
+    assert tracker.position == 50
+    assert travels == [(DoorDirection.OPENING, None)]
+
+
+def test_stop_and_cancel(clock: list[float], tracker: object) -> None:
+    """A stop keeps the estimate, a cancel returns to the start."""
+    tracker.start(DoorDirection.OPENING, 20, 75)
+    clock[0] += 10
+    tracker.stop()
+    assert tracker.position == 50
+
+    tracker.start(DoorDirection.OPENING, 20, 75)
+    clock[0] += 5
+    tracker.cancel()
+    assert tracker.position == 50
@@ -0,0 +1,45 @@
+"""Tests for the request rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from . import integration_module
+
+metrics = integration_module("metrics")
+ratelimit = integration_module("ratelimit")
+
+
+async def test_token_bucket() -> None:
+    """A burst goes through at once, later requests wait for the rate."""
+    bucket = ratelimit.TokenBucket(rate=10, burst=2)
+    assert await bucket.async_acquire() < 0.05
+    assert await bucket.async_acquire() < 0.05
+    # About a tenth of a second, with room for a busy test machine
+    assert 0.05 < await bucket.async_acquire() < 0.5
+
+
+async def test_token_bucket_cancelled() -> None:
+    """A request cancelled while waiting takes no token."""
+    bucket = ratelimit.TokenBucket(rate=2, burst=1)
+    await bucket.async_acquire()
+    waiting = asyncio.create_task(bucket.async_acquire())
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    # Half a second for the next token, a whole one had the waiter taken it
+    assert 0.25 < await bucket.async_acquire() < 0.75
+
+
+async def test_budgets() -> None:
+    """Commands never wait for reads and stop requests for nothing."""
+    limiter = ratelimit.HenCoopRateLimiter(metrics.HenCoopMetrics())
+    limiter.configure(read_rate=0.001, command_rate=60)
+    for _ in range(ratelimit.READ_BURST):
+        await limiter.async_acquire(ratelimit.RequestBudget.READ)
+    async with asyncio.timeout(0.1):
+        await limiter.async_acquire(ratelimit.RequestBudget.COMMAND)
+        await limiter.async_acquire(None)
@@ -0,0 +1,83 @@
+"""Tests for the services acting on all coops at once."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from benchmarks.controller import FakeController
+
+from . import DOMAIN, async_setup_entry, integration_module
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+services = integration_module("services")
+
+
+@pytest.fixture
+async def coops(
+    hass: HomeAssistant, controller: FakeController
+) -> AsyncIterator[list[tuple[MockConfigEntry, FakeController]]]:
+    """Set up entries for two controllers."""
+    other = FakeController()
+    await other.async_start()
+    coops = [
+        (await async_setup_entry(hass, fake.url), fake) for fake in (controller, other)
+    ]
+    yield coops
+    for entry, _ in coops:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await other.async_stop()
+
+
+async def _async_open_all(hass: HomeAssistant, **data: Any) -> dict[str, Any]:
+    """Call the open all service and return the results per entry."""
+    response = await hass.services.async_call(
+        DOMAIN, services.SERVICE_OPEN_ALL, data, blocking=True, return_response=True
+    )
+    return response["results"]
+
+
+@pytest.mark.parametrize("data", [{}, {"config_entry_id": []}])
+async def test_all_coops(
+    hass: HomeAssistant,
+    coops: list[tuple[MockConfigEntry, FakeController]],
+    data: dict[str, Any],
+) -> None:
+    """Without coops, or with an empty list, every coop is commanded."""
+    results = await _async_open_all(hass, **data)
+    assert {entry_id: result["success"] for entry_id, result in results.items()} == {
+        entry.entry_id: True for entry, _ in coops
+    }
+    assert [fake.paths["/open-door"] for _, fake in coops] == [1, 1]
+
+
+async def test_selected_coops(
+    hass: HomeAssistant, coops: list[tuple[MockConfigEntry, FakeController]]
+) -> None:
+    """Only the given coops are commanded, unknown ones are reported."""
+    (first, first_fake), (_, second_fake) = coops
+    results = await _async_open_all(hass, config_entry_id=[first.entry_id, "unknown"])
+    assert results == {
+        first.entry_id: {"title": first.title, "success": True},
+        "unknown": {"success": False, "error": "Not loaded"},
+    }
+    assert first_fake.paths["/open-door"] == 1
+    assert second_fake.paths["/open-door"] == 0
+
+
+async def test_failed_coop(
+    hass: HomeAssistant, coops: list[tuple[MockConfigEntry, FakeController]]
+) -> None:
+    """A coop refusing the command does not fail the others."""
+    (first, _), (second, second_fake) = coops
+    second_fake.failure_rate = 1
+    results = await _async_open_all(hass)
+    assert results[first.entry_id]["success"]
+    assert not results[second.entry_id]["success"]
+    assert "500" in results[second.entry_id]["error"]
@@ -0,0 +1,39 @@
+"""Tests for the HenCoop door switch."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.util import slugify
+
+from . import async_setup_entry, async_wait_for, integration_module
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from benchmarks.controller import FakeController
+
+switch = integration_module("switch")
+
+SWITCH = f"switch.{slugify(switch.ENTITY_DESCRIPTIONS[0].name)}"
+
+
+async def test_door_switch(hass: HomeAssistant, controller: FakeController) -> None:
+    """The switch is on unless the door is closed, and opens or closes it."""
+    entry = await async_setup_entry(hass, controller.url)
+    assert hass.states.get(SWITCH).state == STATE_OFF
+
+    await hass.services.async_call(
+        "switch", "turn_on", {"entity_id": SWITCH}, blocking=True
+    )
+    assert controller.paths["/open-door"] == 1
+    await async_wait_for(lambda: hass.states.get(SWITCH).state == STATE_ON)
+
+    await hass.services.async_call(
+        "switch", "turn_off", {"entity_id": SWITCH}, blocking=True
+    )
+    assert controller.paths["/close-door"] == 1
+    await async_wait_for(lambda: hass.states.get(SWITCH).state == STATE_OFF)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
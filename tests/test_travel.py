@@ -0,0 +1,43 @@
+"""Tests for the learned door travel time."""
+
+from __future__ import annotations
+
+from . import integration_module
+
+const = integration_module("const")
+travel = integration_module("travel")
+DoorDirection = integration_module("motion").DoorDirection
+
+
+def test_default_duration() -> None:
+    """The default motor run is sent until enough travels were seen."""
+    model = travel.DoorTravelModel()
+    for _ in range(travel.TRAVEL_MIN_SAMPLES - 1):
+        model.record(DoorDirection.OPENING, 10)
+    assert model.duration(DoorDirection.OPENING) == const.DOOR_DURATION
+
+
+def test_learned_duration() -> None:
+    """The learned run covers the 90th percentile plus the margins."""
+    model = travel.DoorTravelModel()
+    for seconds in (19, 11, 18, 12, 17, 13, 16, 14, 15, 10):
+        model.record(DoorDirection.CLOSING, seconds)
+    # 18 seconds at the 90th percentile, times 1.2 plus 3 seconds
+    assert model.duration(DoorDirection.CLOSING) == 25
+    assert model.duration(DoorDirection.OPENING) == const.DOOR_DURATION
+
+    # Restored from storage
+    restored = travel.DoorTravelModel(model.as_dict())
+    assert restored.duration(DoorDirection.CLOSING) == 25
+
+
+def test_stall_resets() -> None:
+    """A travel the learned run was too short for starts over from the default."""
+    model = travel.DoorTravelModel()
+    for _ in range(travel.TRAVEL_MIN_SAMPLES):
+        model.record(DoorDirection.OPENING, 10)
+    assert model.duration(DoorDirection.OPENING) < const.DOOR_DURATION
+
+    model.record(DoorDirection.OPENING, None)
+    assert model.duration(DoorDirection.OPENING) == const.DOOR_DURATION
+    assert model.as_dict()[DoorDirection.OPENING] == []